@@ -1,21 +1,90 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Request, Response, BackgroundTasks
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
+from cachetools import TTLCache
+import asyncio
 import httpx
+import msgspec
+import orjson
 import os
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
-
-app = FastAPI(title="Document Search API", version="1.0.0")
+from time import perf_counter, perf_counter_ns
 
 # Vector store service URL
 VECTOR_STORE_URL = os.getenv("VECTOR_STORE_URL", "http://localhost:8001")
 
+# Upper bound on queries per /search-batch call, keeps one request from
+# monopolising the vector store
+MAX_BATCH_QUERIES = 64
+
+# Header for request bodies pre-encoded with orjson
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Recent /search-doc results keyed by (generation, query, limit, min_similarity).
+# Uploads and deletes bump the generation so stale entries are never served.
+SEARCH_CACHE_TTL = 60
+search_cache = TTLCache(maxsize=1024, ttl=SEARCH_CACHE_TTL)
+search_cache_generation = 0
+# One lock per in-flight key so concurrent misses share a single upstream call.
+# A key's lock is dropped only once no request holds or waits on it.
+search_cache_locks: Dict[tuple, asyncio.Lock] = {}
+search_cache_lock_users: Dict[tuple, int] = {}
+
+# Last vector store health probe, reused for HEALTH_CACHE_SECONDS so bursts of
+# liveness probes trigger at most one upstream check
+HEALTH_CACHE_SECONDS = 1.0
+health_state = {"checked_at": float("-inf"), "vector_store_connected": False}
+health_lock = asyncio.Lock()
+
+def invalidate_search_cache():
+    """Make every cached search result stale after the document set changes"""
+    global search_cache_generation
+    search_cache_generation += 1
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Share one pooled vector store client across all requests"""
+    # HTTP/2 is negotiated via ALPN against the https Cloud Run URL; plain
+    # http URLs (docker-compose) fall back to pooled HTTP/1.1 keep-alive
+    app.state.http = httpx.AsyncClient(
+        base_url=VECTOR_STORE_URL,
+        http2=True,
+        timeout=httpx.Timeout(30.0, connect=5.0),
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=200)
+    )
+    yield
+    await app.state.http.aclose()
+
+app = FastAPI(
+    title="Document Search API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+# Document lists and large search results are repetitive JSON; level 5 trades
+# a little CPU for most of the size reduction
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 class SearchRequest(BaseModel):
     query: str
     limit: int = 10
     min_similarity: float = 0.5  # Higher default threshold for better quality results
 
+class SearchQuery(msgspec.Struct):
+    """/search-doc body as decoded at runtime; SearchRequest documents it in OpenAPI"""
+    query: str
+    limit: int = 10
+    min_similarity: float = 0.5
+
+# strict=False keeps pydantic's lax coercions, e.g. "10" for limit
+SEARCH_QUERY_DECODER = msgspec.json.Decoder(SearchQuery, strict=False)
+
 class SearchResult(BaseModel):
     document_id: str
     filename: str
@@ -30,12 +99,33 @@ class SearchResponse(BaseModel):
     number_of_results: int
     results: List[SearchResult]
 
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=MAX_BATCH_QUERIES)
+    limit: int = 10
+    min_similarity: float = 0.5
+
+class BatchSearchItem(BaseModel):
+    query: str
+    number_of_results: int
+    results: List[SearchResult]
+
+class BatchSearchResponse(BaseModel):
+    response_time_ms: float
+    results: List[BatchSearchItem]
+
 class UploadResponse(BaseModel):
     document_id: str
     filename: str
     lines_processed: int
     message: str
 
+class BatchUploadItem(BaseModel):
+    filename: str
+    status: str
+    document_id: Optional[str] = None
+    lines_processed: Optional[int] = None
+    error: Optional[str] = None
+
 class DocumentInfo(BaseModel):
     document_id: str
     filename: str
@@ -44,6 +134,107 @@ class DocumentInfo(BaseModel):
     first_page: int
     last_page: int
 
+class UploadJobResponse(BaseModel):
+    job_id: str
+    filename: str
+    status: str
+    status_url: str
+
+def format_search_results(search_results_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Convert vector store hits to the SearchResult shape, in place.
+    
+    The vector store already drops hits below min_similarity and returns
+    exactly the SearchResult fields apart from naming the text 'content', so
+    renaming that key on the freshly parsed dicts is all that's needed; no
+    per-hit dict or SearchResult is built.
+    """
+    for result in search_results_data:
+        result["text_fragment"] = result.pop("content")
+    return search_results_data
+
+async def vector_store_request(method: str, path: str, not_found_detail: Optional[str] = None, **kwargs) -> httpx.Response:
+    """
+    Send a request to the vector store through the shared client.
+    
+    Args:
+        method: HTTP method
+        path: Path relative to VECTOR_STORE_URL
+        not_found_detail: Error detail to use instead of the upstream body on a 404
+        **kwargs: Passed through to httpx (json, files, timeout, ...)
+        
+    Returns:
+        The upstream response, always a 200
+        
+    Raises:
+        HTTPException: 503 if the vector store is unreachable, otherwise the
+            upstream status code for any non-200 response
+    """
+    try:
+        response = await app.state.http.request(method, path, **kwargs)
+    except httpx.RequestError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Could not connect to vector store service: {str(e)}"
+        )
+    
+    if response.status_code == 404 and not_found_detail:
+        raise HTTPException(status_code=404, detail=not_found_detail)
+    elif response.status_code != 200:
+        raise HTTPException(
+            status_code=response.status_code,
+            detail=f"Vector store error: {response.text}"
+        )
+    
+    return response
+
+def relay_response(response: httpx.Response) -> Response:
+    """Relay upstream JSON as-is instead of parsing and re-serializing it"""
+    return Response(
+        content=response.content,
+        status_code=response.status_code,
+        media_type=response.headers.get("content-type", "application/json")
+    )
+
+async def ensure_pdf(file: UploadFile):
+    """Reject uploads that don't start with the PDF magic bytes, reading only the header"""
+    header = await file.read(5)
+    if header != b"%PDF-":
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    await file.seek(0)
+
+# Background upload jobs by job ID. This is in-process state, so status is
+# only visible on the instance that accepted the upload. Finished jobs stay
+# pollable for UPLOAD_JOB_TTL seconds and then expire.
+UPLOAD_JOB_TTL = 3600
+upload_jobs = TTLCache(maxsize=1024, ttl=UPLOAD_JOB_TTL)
+
+async def ingest_pdf_job(job: Dict[str, Any], filename: str, pdf_file):
+    """Forward a queued PDF to the vector store and record the outcome"""
+    job["status"] = "processing"
+    try:
+        with pdf_file:
+            response = await vector_store_request(
+                "POST",
+                "/upload-pdf",
+                files={"file": (filename, pdf_file, "application/pdf")},
+                timeout=300.0
+            )
+        
+        job["status"] = "completed"
+        job["result"] = response.json()
+        invalidate_search_cache()
+            
+    except HTTPException as e:
+        job["status"] = "failed"
+        job["error"] = e.detail
+    except Exception as e:
+        job["status"] = "failed"
+        job["error"] = f"Error uploading file: {str(e)}"
+    finally:
+        # Re-insert so the TTL counts from when the job finished
+        upload_jobs[job["job_id"]] = job
+
 @app.post("/upload-pdf", response_model=UploadResponse)
 async def upload_pdf(file: UploadFile = File(...)):
     """
@@ -55,148 +246,266 @@ async def upload_pdf(file: UploadFile = File(...)):
     Returns:
         Upload response with document ID and processing details
     """
-    if not file.filename.endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    await ensure_pdf(file)
     
     try:
-        # Read file content
-        file_content = await file.read()
+        # Hand the spooled upload file to httpx so it is streamed to the
+        # vector store in chunks instead of being read into memory first
+        files = {"file": (file.filename, file.file, "application/pdf")}
         
-        # Prepare the file for upload to vector store
-        files = {"file": (file.filename, file_content, "application/pdf")}
+        # PDF indexing can take minutes, so override the shared client's timeout
+        response = await vector_store_request("POST", "/upload-pdf", files=files, timeout=300.0)
         
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(
-                f"{VECTOR_STORE_URL}/upload-pdf",
-                files=files
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
-                )
+        invalidate_search_cache()
+        return UploadResponse(**response.json())
             
-            return UploadResponse(**response.json())
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error uploading file: {str(e)}"
         )
 
-@app.post("/search-doc", response_model=SearchResponse)
-async def search_documents(search_request: SearchRequest):
+async def upload_batch_item(file: UploadFile) -> Dict[str, Any]:
+    """Forward one PDF of a batch upload, reporting failure instead of raising"""
+    try:
+        await ensure_pdf(file)
+        response = await vector_store_request(
+            "POST",
+            "/upload-pdf",
+            files={"file": (file.filename, file.file, "application/pdf")},
+            timeout=300.0
+        )
+        result = response.json()
+        return {
+            "filename": file.filename,
+            "status": "success",
+            "document_id": result["document_id"],
+            "lines_processed": result["lines_processed"]
+        }
+    except HTTPException as e:
+        return {"filename": file.filename, "status": "failed", "error": e.detail}
+    except Exception as e:
+        return {"filename": file.filename, "status": "failed", "error": f"Error uploading file: {str(e)}"}
+
+@app.post("/upload-pdfs", response_model=List[BatchUploadItem])
+async def upload_pdfs(files: List[UploadFile] = File(...)):
+    """
+    Upload several PDF documents to the vector store in one request.
+    
+    Args:
+        files: PDF files to upload
+        
+    Returns:
+        Per-file upload status, in the order the files were sent
+    """
+    results = await asyncio.gather(*(upload_batch_item(file) for file in files))
+    
+    if any(result["status"] == "success" for result in results):
+        invalidate_search_cache()
+    return results
+
+@app.post("/upload-pdf-async", status_code=202, response_model=UploadJobResponse)
+async def upload_pdf_async(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
+    """
+    Queue a PDF document for indexing and return immediately.
+    
+    Args:
+        file: PDF file to upload
+        
+    Returns:
+        Job ID and the URL to poll for the indexing result
+    """
+    await ensure_pdf(file)
+    
+    # The request's upload file is closed once the response is sent, so copy
+    # it to a spool owned by the background job
+    pdf_file = tempfile.SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+    while chunk := await file.read(65536):
+        pdf_file.write(chunk)
+    pdf_file.seek(0)
+    
+    job_id = str(uuid.uuid4())
+    job = {"job_id": job_id, "filename": file.filename, "status": "queued"}
+    upload_jobs[job_id] = job
+    background_tasks.add_task(ingest_pdf_job, job, file.filename, pdf_file)
+    
+    return UploadJobResponse(
+        job_id=job_id,
+        filename=file.filename,
+        status="queued",
+        status_url=f"/upload-status/{job_id}"
+    )
+
+@app.get("/upload-status/{job_id}")
+async def get_upload_status(job_id: str):
+    """
+    Get the state of a queued PDF upload.
+    
+    Args:
+        job_id: The ID returned by /upload-pdf-async
+        
+    Returns:
+        Job status, plus the upload result once completed or the error if failed
+    """
+    job = upload_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Upload job not found or expired")
+    return job
+
+@app.post(
+    "/search-doc",
+    responses={200: {"model": SearchResponse}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": SearchRequest.model_json_schema()}}
+        }
+    }
+)
+async def search_documents(request: Request):
     """
     Search for documents using the provided search string.
     
     Args:
-        search_request: Search query and optional limit
+        request: JSON body with the search query and optional limit and
+            min_similarity, decoded with msgspec instead of pydantic
         
     Returns:
         Search response with timing, count, and matching document fragments
     """
-    import time
-    start_time = time.time()
+    start_time = perf_counter_ns()
     
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.post(
-                f"{VECTOR_STORE_URL}/search",
-                json=search_request.dict()
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
+        search_request = SEARCH_QUERY_DECODER.decode(await request.body())
+    except msgspec.DecodeError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid search request: {str(e)}")
+    
+    cache_key = (
+        search_cache_generation,
+        search_request.query.strip().lower(),
+        search_request.limit,
+        search_request.min_similarity
+    )
+    lock = search_cache_locks.setdefault(cache_key, asyncio.Lock())
+    search_cache_lock_users[cache_key] = search_cache_lock_users.get(cache_key, 0) + 1
+    
+    try:
+        async with lock:
+            search_results = search_cache.get(cache_key)
+            if search_results is None:
+                response = await vector_store_request(
+                    "POST",
+                    "/search",
+                    content=msgspec.json.encode(search_request),
+                    headers=JSON_HEADERS
                 )
-            
-            search_results_data = response.json()
-            
-            # Convert to new format and filter by similarity
-            search_results = []
-            for result in search_results_data:
-                similarity_score = result["similarity_score"]
-                if similarity_score >= search_request.min_similarity:
-                    search_result = SearchResult(
-                        document_id=result["document_id"],
-                        filename=result["filename"],
-                        page_number=result["page_number"],
-                        line_number=result["line_number"],
-                        text_fragment=result["content"],
-                        similarity_score=similarity_score
-                    )
-                    search_results.append(search_result)
-            
-            # Calculate response time
-            end_time = time.time()
-            response_time_ms = (end_time - start_time) * 1000
-            
-            return SearchResponse(
-                query=search_request.query,
-                response_time_ms=round(response_time_ms, 2),
-                number_of_results=len(search_results),
-                results=search_results
-            )
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
+                search_results = format_search_results(response.json())
+                search_cache[cache_key] = search_results
+        
+        # Calculate response time
+        response_time_ms = (perf_counter_ns() - start_time) / 1_000_000
+        
+        body = orjson.dumps({
+            "query": search_request.query,
+            "response_time_ms": round(response_time_ms, 2),
+            "number_of_results": len(search_results),
+            "results": search_results
+        })
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"Cache-Control": f"max-age={SEARCH_CACHE_TTL}"}
         )
+        
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error during search: {str(e)}"
         )
+    finally:
+        users = search_cache_lock_users[cache_key] - 1
+        if users:
+            search_cache_lock_users[cache_key] = users
+        else:
+            del search_cache_lock_users[cache_key]
+            del search_cache_locks[cache_key]
 
-@app.get("/documents/{document_id}")
-async def get_document(document_id: str):
+@app.post("/search-batch", responses={200: {"model": BatchSearchResponse}})
+async def search_documents_batch(batch_request: BatchSearchRequest):
     """
-    Get all lines for a specific document by document ID.
+    Search for several queries in one round trip to the vector store.
     
     Args:
-        document_id: The ID of the document to retrieve
+        batch_request: Up to MAX_BATCH_QUERIES queries sharing one limit and threshold
         
     Returns:
-        Document with all its lines
+        Overall timing and one result set per query, in input order.
+        Repeated queries are searched once and share the same result set.
     """
+    start_time = perf_counter_ns()
+    
+    # Send each distinct query upstream once; query_slots maps every input
+    # position to its index in unique_queries
+    unique_queries: Dict[str, int] = {}
+    query_slots = [unique_queries.setdefault(query, len(unique_queries)) for query in batch_request.queries]
+    
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                f"{VECTOR_STORE_URL}/documents/{document_id}"
-            )
-            
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Document not found")
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
+        response = await vector_store_request(
+            "POST",
+            "/search-batch",
+            content=orjson.dumps({
+                "queries": list(unique_queries),
+                "limit": batch_request.limit,
+                "min_similarity": batch_request.min_similarity
+            }),
+            headers=JSON_HEADERS
         )
+        
+        unique_results = [format_search_results(search_results_data) for search_results_data in response.json()]
+        batch_results = [
+            {
+                "query": query,
+                "number_of_results": len(unique_results[slot]),
+                "results": unique_results[slot]
+            }
+            for query, slot in zip(batch_request.queries, query_slots)
+        ]
+        
+        response_time_ms = (perf_counter_ns() - start_time) / 1_000_000
+        
+        return ORJSONResponse({
+            "response_time_ms": round(response_time_ms, 2),
+            "results": batch_results
+        })
+        
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
-            detail=f"Error retrieving document: {str(e)}"
+            detail=f"Error during batch search: {str(e)}"
         )
 
-@app.get("/documents", response_model=List[DocumentInfo])
+@app.get("/documents/{document_id}")
+async def get_document(document_id: str):
+    """
+    Get all lines for a specific document by document ID.
+    
+    Args:
+        document_id: The ID of the document to retrieve
+        
+    Returns:
+        Document with all its lines
+    """
+    response = await vector_store_request("GET", f"/documents/{document_id}", not_found_detail="Document not found")
+    return relay_response(response)
+
+
+@app.get("/documents", responses={200: {"model": List[DocumentInfo]}})
 async def list_documents():
     """
     Get list of all documents with metadata.
@@ -204,28 +513,9 @@ async def list_documents():
     Returns:
         List of documents with metadata including upload date, line counts, and page ranges
     """
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(f"{VECTOR_STORE_URL}/documents")
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
-        )
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error listing documents: {str(e)}"
-        )
+    response = await vector_store_request("GET", "/documents")
+    return relay_response(response)
+
 
 @app.delete("/documents")
 async def delete_all_documents():
@@ -235,30 +525,10 @@ async def delete_all_documents():
     Returns:
         Deletion confirmation with count of deleted documents and lines
     """
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.delete(f"{VECTOR_STORE_URL}/documents")
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error deleting all documents: {str(e)}"
-        )
+    response = await vector_store_request("DELETE", "/documents")
+    invalidate_search_cache()
+    return relay_response(response)
+
 
 @app.delete("/documents/{document_id}")
 async def delete_document(document_id: str):
@@ -271,48 +541,32 @@ async def delete_document(document_id: str):
     Returns:
         Deletion confirmation with document details
     """
-    try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.delete(f"{VECTOR_STORE_URL}/documents/{document_id}")
-            
-            if response.status_code == 404:
-                raise HTTPException(status_code=404, detail="Document not found")
-            elif response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Vector store error: {response.text}"
-                )
-            
-            return response.json()
-            
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=503,
-            detail=f"Could not connect to vector store service: {str(e)}"
-        )
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Error deleting document: {str(e)}"
-        )
+    response = await vector_store_request("DELETE", f"/documents/{document_id}", not_found_detail="Document not found")
+    invalidate_search_cache()
+    return relay_response(response)
+
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    try:
-        # Check if vector store is healthy
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(f"{VECTOR_STORE_URL}/health")
-            vector_store_healthy = response.status_code == 200
-    except:
-        vector_store_healthy = False
+    if perf_counter() - health_state["checked_at"] >= HEALTH_CACHE_SECONDS:
+        async with health_lock:
+            # Another request may have refreshed the probe while we waited
+            if perf_counter() - health_state["checked_at"] >= HEALTH_CACHE_SECONDS:
+                try:
+                    # Check if vector store is healthy
+                    response = await app.state.http.get("/health", timeout=2.0)
+                    vector_store_healthy = response.status_code == 200
+                except Exception:
+                    vector_store_healthy = False
+                
+                health_state["vector_store_connected"] = vector_store_healthy
+                health_state["checked_at"] = perf_counter()
     
     return {
         "status": "healthy",
         "service": "api-backend",
-        "vector_store_connected": vector_store_healthy
+        "vector_store_connected": health_state["vector_store_connected"]
     }
 
 # Root endpoint with API information
@@ -324,7 +578,11 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "upload": "/upload-pdf - Upload PDF documents",
+            "upload_batch": "/upload-pdfs - Upload several PDF documents in one request",
+            "upload_async": "/upload-pdf-async - Queue PDF documents for background indexing",
+            "upload_status": "/upload-status/{job_id} - Get background upload status",
             "search": "/search-doc - Search documents",
+            "search_batch": "/search-batch - Search documents for several queries at once",
             "documents": "/documents - List all documents",
             "document": "/documents/{document_id} - Get document by ID",
             "delete_all": "DELETE /documents - Delete all documents",
@@ -338,4 +596,13 @@ if __name__ == "__main__":
     import uvicorn
     # Use the PORT environment variable provided by Cloud Run, fallback to 8000 for local dev
     port = int(os.environ.get("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    # Upload jobs and caches are per process, so keep WEB_CONCURRENCY at 1
+    # unless status polling is pinned to a worker
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        loop="uvloop",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", "1"))
+    )
\ No newline at end of file
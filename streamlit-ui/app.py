@@ -1,17 +1,27 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-import time
+import orjson
 import json
-from typing import List, Dict, Any
+import csv
+import html
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 
 # Configuration
 API_BASE_URL = "http://api-backend:8000"  # Docker internal URL
 # For local development, use: "http://localhost:8000"
+MAX_UPLOAD_WORKERS = 8  # Concurrent PDF uploads per click
 
+@lru_cache(maxsize=1)
 def get_api_url():
-    """Get the appropriate API URL based on environment"""
-    import os
+    """Get the appropriate API URL based on environment (memoized; use get_api_url.cache_clear() to re-read)"""
     # Check for environment variable first, then fallback to local detection
     api_url = os.getenv("API_BASE_URL")
     if api_url:
@@ -22,6 +32,80 @@ def get_api_url():
         return "http://localhost:8000"
     return API_BASE_URL
 
+@st.cache_resource
+def get_session() -> requests.Session:
+    """
+    Get the pooled session used for every API call.
+    
+    Streamlit re-executes this script on each rerun, so the session is held in
+    st.cache_resource to keep its connections alive across reruns; the upload
+    threads share it too. Only idempotent requests are retried.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_data(ttl=15, show_spinner=False)
+def fetch_documents(api_url: str) -> List[Dict[str, Any]]:
+    """Fetch the document list, cached briefly so widget reruns don't re-hit the API"""
+    response = get_session().get(f"{api_url}/documents", timeout=10)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl=60, max_entries=128, show_spinner=False)
+def fetch_search_results(api_url: str, query: str, limit: int, min_similarity: float) -> Dict[str, Any]:
+    """Run a search, cached per (query, limit, min_similarity) so repeated searches skip the API"""
+    response = get_session().post(
+        f"{api_url}/search-doc",
+        json={"query": query, "limit": limit, "min_similarity": min_similarity},
+        timeout=30
+    )
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+@st.cache_data(ttl=5, show_spinner=False)
+def fetch_health(api_url: str):
+    """
+    Fetch the API health as (status code, body), cached briefly across reruns.
+    
+    The status code is None when the API can't be reached. Failures are cached
+    too, so a down backend doesn't cost a timeout on every rerun.
+    """
+    try:
+        response = get_session().get(f"{api_url}/health", timeout=5)
+        return response.status_code, response.json() if response.ok else {}
+    except Exception:
+        return None, {}
+
+def format_upload_date(upload_date: str) -> str:
+    """Format an ISO upload timestamp from the API for display"""
+    return datetime.fromisoformat(upload_date).strftime('%Y-%m-%d %H:%M:%S')
+
+@st.cache_data(show_spinner=False)
+def documents_csv(documents: List[Dict[str, Any]]) -> str:
+    """Serialize the document list for export, cached while the list is unchanged"""
+    export_df = pd.DataFrame(documents, columns=["filename", "document_id", "upload_date", "lines_count", "first_page", "last_page"])
+    export_df["upload_date"] = export_df["upload_date"].map(format_upload_date)
+    return export_df.to_csv(index=False)
+
+@st.cache_data(show_spinner=False)
+def search_results_csv(results: List[Dict[str, Any]]) -> str:
+    """Serialize search results for export, cached per result set; written row by row, no DataFrame needed"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["document_id", "filename", "page_number", "line_number", "similarity_score", "text_fragment"])
+    writer.writerows(
+        (r["document_id"], r["filename"], r["page_number"], r["line_number"], f"{r['similarity_score']:.4f}", r["text_fragment"])
+        for r in results
+    )
+    return buffer.getvalue()
+
 # Page configuration
 st.set_page_config(
     page_title="PDF Document Search",
@@ -38,36 +122,90 @@ st.markdown("""
         padding: 1rem 0;
         color: #1f77b4;
     }
-    .search-box {
-        background-color: #f0f2f6;
-        padding: 1rem;
-        border-radius: 10px;
-        margin: 1rem 0;
-    }
-    .result-card {
-        background-color: #ffffff;
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #1f77b4;
-        margin: 0.5rem 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
     .metric-card {
         background-color: #f8f9fa;
         padding: 1rem;
         border-radius: 8px;
         text-align: center;
     }
-    .danger-zone {
-        background-color: #fff5f5;
-        border: 2px solid #fed7d7;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-    }
 </style>
 """, unsafe_allow_html=True)
 
+def upload_single_pdf(session: requests.Session, api_url: str, uploaded_file) -> Dict[str, Any]:
+    """Upload one PDF and return its row for the upload results table"""
+    try:
+        # Pass the file object rather than a getvalue() copy of its bytes; rewind
+        # it in case a batch attempt already read it
+        uploaded_file.seek(0)
+        files = {"file": (uploaded_file.name, uploaded_file, "application/pdf")}
+        
+        # Upload to API
+        response = session.post(
+            f"{api_url}/upload-pdf",
+            files=files,
+            timeout=300
+        )
+        
+        if response.status_code == 200:
+            result = response.json()
+            return {
+                "filename": uploaded_file.name,
+                "status": "✅ Success",
+                "document_id": result["document_id"],
+                "lines_processed": result["lines_processed"]
+            }
+        return {
+            "filename": uploaded_file.name,
+            "status": "❌ Failed",
+            "error": response.text[:100]
+        }
+    
+    except Exception as e:
+        return {
+            "filename": uploaded_file.name,
+            "status": "❌ Error",
+            "error": str(e)[:100]
+        }
+
+def upload_pdf_batch(session: requests.Session, api_url: str, uploaded_files) -> Optional[List[Dict[str, Any]]]:
+    """Upload all PDFs in one request, or return None if the backend has no /upload-pdfs"""
+    try:
+        for uploaded_file in uploaded_files:
+            uploaded_file.seek(0)
+        files = [("files", (uploaded_file.name, uploaded_file, "application/pdf")) for uploaded_file in uploaded_files]
+        response = session.post(f"{api_url}/upload-pdfs", files=files, timeout=600)
+        
+        if response.status_code == 404:
+            return None
+        if response.status_code != 200:
+            return [
+                {"filename": uploaded_file.name, "status": "❌ Failed", "error": response.text[:100]}
+                for uploaded_file in uploaded_files
+            ]
+        
+        results = []
+        for item in response.json():
+            if item["status"] == "success":
+                results.append({
+                    "filename": item["filename"],
+                    "status": "✅ Success",
+                    "document_id": item["document_id"],
+                    "lines_processed": item["lines_processed"]
+                })
+            else:
+                results.append({
+                    "filename": item["filename"],
+                    "status": "❌ Failed",
+                    "error": str(item.get("error"))[:100]
+                })
+        return results
+    
+    except Exception as e:
+        return [
+            {"filename": uploaded_file.name, "status": "❌ Error", "error": str(e)[:100]}
+            for uploaded_file in uploaded_files
+        ]
+
 def upload_pdf():
     """Function to upload PDF documents"""
     st.markdown('<div class="main-header"><h2>📄 Upload PDF Documents</h2></div>', unsafe_allow_html=True)
@@ -85,50 +223,47 @@ def upload_pdf():
             if st.button("🚀 Upload Documents", type="primary", use_container_width=True):
                 upload_progress = st.progress(0)
                 upload_status = st.empty()
-                results = []
                 
-                for i, uploaded_file in enumerate(uploaded_files):
-                    upload_status.info(f"Uploading {uploaded_file.name}...")
+                api_url = get_api_url()
+                session = get_session()  # Resolved here; cache_resource needs the script thread
+                upload_status.info(f"Uploading {len(uploaded_files)} file(s)...")
+                
+                # Send every file in one request when the backend supports it
+                results = upload_pdf_batch(session, api_url, uploaded_files)
+                
+                if results is not None:
+                    upload_progress.progress(1.0)
+                    failed_uploads = [r["filename"] for r in results if r["status"] != "✅ Success"]
+                    if failed_uploads:
+                        upload_status.error(f"❌ Failed to upload {', '.join(failed_uploads)}")
+                    else:
+                        upload_status.success("✅ All files uploaded successfully!")
+                
+                else:
+                    results = []
                     
-                    try:
-                        # Prepare file for upload
-                        files = {"file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")}
+                    # Per-file fallback: uploads are I/O-bound, so overlap them
+                    with ThreadPoolExecutor(max_workers=min(MAX_UPLOAD_WORKERS, len(uploaded_files))) as executor:
+                        futures = {
+                            executor.submit(upload_single_pdf, session, api_url, uploaded_file): uploaded_file
+                            for uploaded_file in uploaded_files
+                        }
                         
-                        # Upload to API
-                        response = requests.post(
-                            f"{get_api_url()}/upload-pdf",
-                            files=files,
-                            timeout=300
-                        )
-                        
-                        if response.status_code == 200:
-                            result = response.json()
-                            results.append({
-                                "filename": uploaded_file.name,
-                                "status": "✅ Success",
-                                "document_id": result["document_id"],
-                                "lines_processed": result["lines_processed"]
-                            })
-                            upload_status.success(f"✅ {uploaded_file.name} uploaded successfully!")
-                        else:
-                            results.append({
-                                "filename": uploaded_file.name,
-                                "status": "❌ Failed",
-                                "error": response.text[:100]
-                            })
-                            upload_status.error(f"❌ Failed to upload {uploaded_file.name}")
-                    
-                    except Exception as e:
-                        results.append({
-                            "filename": uploaded_file.name,
-                            "status": "❌ Error",
-                            "error": str(e)[:100]
-                        })
-                        upload_status.error(f"❌ Error uploading {uploaded_file.name}: {str(e)}")
-                    
-                    # Update progress
-                    upload_progress.progress((i + 1) / len(uploaded_files))
-                
+                        for i, future in enumerate(as_completed(futures)):
+                            uploaded_file = futures[future]
+                            result = future.result()
+                            results.append(result)
+                            
+                            if result["status"] == "✅ Success":
+                                upload_status.success(f"✅ {uploaded_file.name} uploaded successfully!")
+                            elif result["status"] == "❌ Failed":
+                                upload_status.error(f"❌ Failed to upload {uploaded_file.name}")
+                            else:
+                                upload_status.error(f"❌ Error uploading {uploaded_file.name}: {result['error']}")
+                            
+                            # Update progress
+                            upload_progress.progress((i + 1) / len(uploaded_files))
+            
                 # Display results
                 st.markdown("### Upload Results")
                 results_df = pd.DataFrame(results)
@@ -137,6 +272,8 @@ def upload_pdf():
                 # Success summary
                 successful_uploads = len([r for r in results if "Success" in r["status"]])
                 if successful_uploads > 0:
+                    fetch_documents.clear()
+                    fetch_search_results.clear()
                     st.success(f"🎉 Successfully uploaded {successful_uploads} out of {len(uploaded_files)} documents!")
 
 def list_documents():
@@ -146,212 +283,202 @@ def list_documents():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("🔄 Refresh Document List", type="secondary", use_container_width=True):
+            fetch_documents.clear()
             st.rerun()
     
     try:
         # Get document list from API
-        response = requests.get(f"{get_api_url()}/documents", timeout=10)
+        documents = fetch_documents(get_api_url())
         
-        if response.status_code == 200:
-            documents = response.json()
+        if documents:
+            st.markdown("### 📋 Loaded Documents")
             
-            if documents:
-                st.markdown("### 📋 Loaded Documents")
-                
-                # Create a DataFrame for better display
-                df_data = []
-                for doc in documents:
-                    # Format upload date
-                    upload_date = pd.to_datetime(doc['upload_date']).strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    df_data.append({
-                        "📄 Filename": doc['filename'],
-                        "🆔 Document ID": doc['document_id'][:8] + "...",  # Shortened for display
-                        "📅 Upload Date": upload_date,
-                        "📊 Lines": doc['lines_count'],
-                        "📖 Pages": f"{doc['first_page']}-{doc['last_page']}" if doc['first_page'] != doc['last_page'] else str(doc['first_page'])
-                    })
-                
-                df = pd.DataFrame(df_data)
-                
-                # Display as a nice table
-                st.dataframe(df, use_container_width=True, hide_index=True)
-                
-                # Summary statistics
-                st.markdown("### 📈 Library Statistics")
-                col1, col2, col3, col4 = st.columns(4)
-                
-                total_docs = len(documents)
-                total_lines = sum(doc['lines_count'] for doc in documents)
-                total_pages = sum(doc['last_page'] - doc['first_page'] + 1 for doc in documents)
-                avg_lines = total_lines / total_docs if total_docs > 0 else 0
+            # Build the DataFrame once and derive the display columns from it
+            full_df = pd.DataFrame(documents)
+            full_df['upload_date'] = full_df['upload_date'].map(format_upload_date)
+            first_page = full_df['first_page'].astype(str)
+            page_range = first_page.where(
+                full_df['first_page'] == full_df['last_page'],
+                first_page + "-" + full_df['last_page'].astype(str)
+            )
+            
+            df = pd.DataFrame({
+                "📄 Filename": full_df['filename'],
+                "🆔 Document ID": full_df['document_id'].str[:8] + "...",  # Shortened for display
+                "📅 Upload Date": full_df['upload_date'],
+                "📊 Lines": full_df['lines_count'],
+                "📖 Pages": page_range
+            })
+            
+            # Display as a nice table
+            st.dataframe(df, use_container_width=True, hide_index=True)
+            
+            # Summary statistics
+            st.markdown("### 📈 Library Statistics")
+            col1, col2, col3, col4 = st.columns(4)
+            
+            total_docs = len(full_df)
+            total_lines = int(full_df['lines_count'].sum())
+            total_pages = int((full_df['last_page'] - full_df['first_page'] + 1).sum())
+            avg_lines = full_df['lines_count'].mean() if total_docs > 0 else 0
+            
+            with col1:
+                st.metric("📚 Total Documents", total_docs)
+            
+            with col2:
+                st.metric("📝 Total Lines", f"{total_lines:,}")
+            
+            with col3:
+                st.metric("📖 Total Pages", total_pages)
+            
+            with col4:
+                st.metric("📊 Avg Lines/Doc", f"{avg_lines:.0f}")
+            
+            # Export option
+            # Include full document IDs in export
+            st.download_button(
+                label="📥 Export Document List as CSV",
+                data=documents_csv(documents),
+                file_name="document_library.csv",
+                mime="text/csv"
+            )
+            
+            # Individual document actions
+            st.markdown("### 🔍 Document Actions")
+            labels = [f"{doc['filename']} ({doc['document_id'][:8]}...)" for doc in documents]
+            label_to_doc = dict(zip(labels, documents))
+            selected_doc = st.selectbox(
+                "Select a document to view details:",
+                options=labels,
+                help="Choose a document to view its details or perform actions"
+            )
+            
+            if selected_doc:
+                # Find the selected document
+                selected_document = label_to_doc[selected_doc]
                 
+                col1, col2, col3 = st.columns(3)
                 with col1:
-                    st.metric("📚 Total Documents", total_docs)
+                    if st.button("📄 View Document Contents", use_container_width=True):
+                        st.info(f"Document ID: {selected_document['document_id']}")
+                        st.info(f"To view full contents, use the API endpoint: GET /documents/{selected_document['document_id']}")
                 
                 with col2:
-                    st.metric("📝 Total Lines", f"{total_lines:,}")
+                    if st.button("🔍 Search in This Document", use_container_width=True):
+                        st.info("Use the Search Documents tab and filter results by document ID to search within this specific document.")
                 
                 with col3:
-                    st.metric("📖 Total Pages", total_pages)
-                
-                with col4:
-                    st.metric("📊 Avg Lines/Doc", f"{avg_lines:.0f}")
-                
-                # Export option
-                if st.button("📥 Export Document List as CSV"):
-                    # Include full document IDs in export
-                    export_data = []
-                    for doc in documents:
-                        upload_date = pd.to_datetime(doc['upload_date']).strftime('%Y-%m-%d %H:%M:%S')
-                        export_data.append({
-                            "filename": doc['filename'],
-                            "document_id": doc['document_id'],
-                            "upload_date": upload_date,
-                            "lines_count": doc['lines_count'],
-                            "first_page": doc['first_page'],
-                            "last_page": doc['last_page']
-                        })
-                    
-                    export_df = pd.DataFrame(export_data)
-                    csv = export_df.to_csv(index=False)
-                    st.download_button(
-                        label="⬇️ Download CSV",
-                        data=csv,
-                        file_name="document_library.csv",
-                        mime="text/csv"
-                    )
-                
-                # Individual document actions
-                st.markdown("### 🔍 Document Actions")
-                selected_doc = st.selectbox(
-                    "Select a document to view details:",
-                    options=[f"{doc['filename']} ({doc['document_id'][:8]}...)" for doc in documents],
-                    help="Choose a document to view its details or perform actions"
-                )
+                    if st.button("🗑️ Delete Document", use_container_width=True, type="secondary"):
+                        # Use session state to manage confirmation; the form below
+                        # renders in this same run, so no extra rerun is needed
+                        st.session_state.confirm_delete = True
                 
-                if selected_doc:
-                    # Find the selected document
-                    doc_index = [f"{doc['filename']} ({doc['document_id'][:8]}...)" for doc in documents].index(selected_doc)
-                    selected_document = documents[doc_index]
-                    
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        if st.button("📄 View Document Contents", use_container_width=True):
-                            st.info(f"Document ID: {selected_document['document_id']}")
-                            st.info(f"To view full contents, use the API endpoint: GET /documents/{selected_document['document_id']}")
-                    
-                    with col2:
-                        if st.button("🔍 Search in This Document", use_container_width=True):
-                            st.info("Use the Search Documents tab and filter results by document ID to search within this specific document.")
-                    
-                    with col3:
-                        if st.button("🗑️ Delete Document", use_container_width=True, type="secondary"):
-                            # Use session state to manage confirmation
-                            if 'confirm_delete' not in st.session_state:
-                                st.session_state.confirm_delete = False
-                            
-                            if not st.session_state.confirm_delete:
-                                st.session_state.confirm_delete = True
-                                st.rerun()
-                    
-                    # Show confirmation dialog if delete was clicked
-                    if st.session_state.get('confirm_delete', False):
+                # Show confirmation form if delete was clicked; submitting it
+                # triggers a single rerun
+                if st.session_state.get('confirm_delete', False):
+                    with st.form("delete_form"):
                         st.warning(f"⚠️ Are you sure you want to delete '{selected_document['filename']}'?")
                         col_confirm1, col_confirm2 = st.columns(2)
                         
                         with col_confirm1:
-                            if st.button("✅ Yes, Delete", key="confirm_delete_btn", type="primary"):
-                                try:
-                                    delete_response = requests.delete(
-                                        f"{get_api_url()}/documents/{selected_document['document_id']}",
-                                        timeout=30
-                                    )
-                                    
-                                    if delete_response.status_code == 200:
-                                        result = delete_response.json()
-                                        st.success(f"✅ Document '{result['filename']}' deleted successfully!")
-                                        st.info(f"Deleted {result['deleted_lines']} lines")
-                                        st.session_state.confirm_delete = False
-                                        time.sleep(2)
-                                        st.rerun()
-                                    else:
-                                        st.error(f"❌ Failed to delete document: {delete_response.text}")
-                                        st.session_state.confirm_delete = False
-                                
-                                except Exception as e:
-                                    st.error(f"❌ Error deleting document: {str(e)}")
-                                    st.session_state.confirm_delete = False
+                            confirmed = st.form_submit_button("✅ Yes, Delete", type="primary")
                         
                         with col_confirm2:
-                            if st.button("❌ Cancel", key="cancel_delete_btn"):
+                            cancelled = st.form_submit_button("❌ Cancel")
+                    
+                    if confirmed:
+                        try:
+                            delete_response = get_session().delete(
+                                f"{get_api_url()}/documents/{selected_document['document_id']}",
+                                timeout=30
+                            )
+                            
+                            if delete_response.status_code == 200:
+                                result = delete_response.json()
+                                # A toast survives the rerun, so there's no need to pause for it
+                                st.toast(f"Document '{result['filename']}' deleted ({result['deleted_lines']} lines)", icon="✅")
                                 st.session_state.confirm_delete = False
+                                fetch_documents.clear()
+                                fetch_search_results.clear()
                                 st.rerun()
-                
-                # Bulk actions section
-                st.markdown("### 🔧 Bulk Actions")
-                st.markdown('<div class="danger-zone">', unsafe_allow_html=True)
-                st.error("⚠️ **Danger Zone** - These actions cannot be undone!")
-                
-                if st.button("🗑️ Delete All Documents", type="secondary", use_container_width=True):
-                    # Use session state for bulk delete confirmation
-                    if 'confirm_delete_all' not in st.session_state:
-                        st.session_state.confirm_delete_all = False
+                            else:
+                                st.error(f"❌ Failed to delete document: {delete_response.text}")
+                                st.session_state.confirm_delete = False
+                        
+                        except Exception as e:
+                            st.error(f"❌ Error deleting document: {str(e)}")
+                            st.session_state.confirm_delete = False
                     
-                    if not st.session_state.confirm_delete_all:
-                        st.session_state.confirm_delete_all = True
+                    elif cancelled:
+                        st.session_state.confirm_delete = False
                         st.rerun()
-                
-                # Show bulk delete confirmation
-                if st.session_state.get('confirm_delete_all', False):
+            
+            # Bulk actions section
+            st.markdown("### 🔧 Bulk Actions")
+            st.error("⚠️ **Danger Zone** - These actions cannot be undone!")
+            
+            if st.button("🗑️ Delete All Documents", type="secondary", use_container_width=True):
+                # Use session state for bulk delete confirmation; it renders
+                # below in this same run, so no extra rerun is needed
+                st.session_state.confirm_delete_all = True
+            
+            # Show bulk delete confirmation; the typed text is only read on
+            # submit, so typing doesn't rerun the page per keystroke
+            if st.session_state.get('confirm_delete_all', False):
+                with st.form("bulk_delete_form"):
                     st.error("⚠️ **DANGER**: This will permanently delete ALL documents!")
-                    st.write("Type 'DELETE ALL' to confirm:")
-                    
-                    confirmation_text = st.text_input("Confirmation:", key="delete_all_confirm")
+                    confirmation_text = st.text_input("Type 'DELETE ALL' to confirm:", key="delete_all_confirm")
                     
                     col_confirm1, col_confirm2 = st.columns(2)
                     with col_confirm1:
-                        if st.button("💀 Confirm Deletion", key="confirm_delete_all_btn", type="primary", disabled=(confirmation_text != "DELETE ALL")):
-                            try:
-                                delete_response = requests.delete(
-                                    f"{get_api_url()}/documents",
-                                    timeout=30
-                                )
-                                
-                                if delete_response.status_code == 200:
-                                    result = delete_response.json()
-                                    st.success(f"✅ {result['message']}")
-                                    st.info(f"Deleted {result.get('deleted_documents', 0)} documents and {result.get('deleted_lines', 0)} lines")
-                                    st.session_state.confirm_delete_all = False
-                                    time.sleep(3)
-                                    st.rerun()
-                                else:
-                                    st.error(f"❌ Failed to delete documents: {delete_response.text}")
-                                    st.session_state.confirm_delete_all = False
-                            
-                            except Exception as e:
-                                st.error(f"❌ Error deleting all documents: {str(e)}")
-                                st.session_state.confirm_delete_all = False
-                    
+                        confirmed = st.form_submit_button("💀 Confirm Deletion", type="primary")
                     with col_confirm2:
-                        if st.button("❌ Cancel All", key="cancel_delete_all_btn"):
+                        cancelled = st.form_submit_button("❌ Cancel All")
+                
+                if confirmed and confirmation_text != "DELETE ALL":
+                    st.warning("⚠️ Type 'DELETE ALL' exactly to confirm")
+                
+                elif confirmed:
+                    try:
+                        delete_response = get_session().delete(
+                            f"{get_api_url()}/documents",
+                            timeout=30
+                        )
+                        
+                        if delete_response.status_code == 200:
+                            result = delete_response.json()
+                            st.toast(
+                                f"{result['message']} - deleted {result.get('deleted_documents', 0)} documents and {result.get('deleted_lines', 0)} lines",
+                                icon="✅"
+                            )
                             st.session_state.confirm_delete_all = False
+                            fetch_documents.clear()
+                            fetch_search_results.clear()
                             st.rerun()
+                        else:
+                            st.error(f"❌ Failed to delete documents: {delete_response.text}")
+                            st.session_state.confirm_delete_all = False
+                    
+                    except Exception as e:
+                        st.error(f"❌ Error deleting all documents: {str(e)}")
+                        st.session_state.confirm_delete_all = False
                 
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            else:
-                st.info("📭 No documents found in the library.")
-                st.markdown("""
-                ### 💡 Getting Started
-                1. Go to the **Upload PDFs** tab
-                2. Select one or more PDF files
-                3. Click **Upload Documents**
-                4. Return here to see your document library
-                """)
+                elif cancelled:
+                    st.session_state.confirm_delete_all = False
+                    st.rerun()
         
         else:
-            st.error(f"❌ Failed to fetch documents: {response.text}")
+            st.info("📭 No documents found in the library.")
+            st.markdown("""
+            ### 💡 Getting Started
+            1. Go to the **Upload PDFs** tab
+            2. Select one or more PDF files
+            3. Click **Upload Documents**
+            4. Return here to see your document library
+            """)
+    
+    except requests.exceptions.HTTPError as e:
+        st.error(f"❌ Failed to fetch documents: {e.response.text}")
     
     except requests.exceptions.RequestException as e:
         st.error(f"❌ Connection error: {str(e)}")
@@ -363,41 +490,39 @@ def list_documents():
     # API Health status (always show)
     st.markdown("---")
     st.markdown("### 🏥 System Health")
-    try:
-        health_response = requests.get(f"{get_api_url()}/health", timeout=5)
-        if health_response.status_code == 200:
-            health_data = health_response.json()
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.markdown("""
-                <div class="metric-card">
-                    <h4>🔗 API Backend</h4>
-                    <p style="color: green; font-weight: bold;">✅ Healthy</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col2:
-                vector_status = "✅ Connected" if health_data.get("vector_store_connected", False) else "❌ Disconnected"
-                color = "green" if health_data.get("vector_store_connected", False) else "red"
-                st.markdown(f"""
-                <div class="metric-card">
-                    <h4>🗄️ Vector Store</h4>
-                    <p style="color: {color}; font-weight: bold;">{vector_status}</p>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with col3:
-                st.markdown("""
-                <div class="metric-card">
-                    <h4>⚡ Status</h4>
-                    <p style="color: blue; font-weight: bold;">🟢 Ready</p>
-                </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.error("🔴 API Backend Offline")
-    except:
+    health_status, health_data = fetch_health(get_api_url())
+    if health_status == 200:
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.markdown("""
+            <div class="metric-card">
+                <h4>🔗 API Backend</h4>
+                <p style="color: green; font-weight: bold;">✅ Healthy</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col2:
+            vector_status = "✅ Connected" if health_data.get("vector_store_connected", False) else "❌ Disconnected"
+            color = "green" if health_data.get("vector_store_connected", False) else "red"
+            st.markdown(f"""
+            <div class="metric-card">
+                <h4>🗄️ Vector Store</h4>
+                <p style="color: {color}; font-weight: bold;">{vector_status}</p>
+            </div>
+            """, unsafe_allow_html=True)
+        
+        with col3:
+            st.markdown("""
+            <div class="metric-card">
+                <h4>⚡ Status</h4>
+                <p style="color: blue; font-weight: bold;">🟢 Ready</p>
+            </div>
+            """, unsafe_allow_html=True)
+    elif health_status is None:
         st.error("🔴 Cannot reach API Backend")
+    else:
+        st.error("🔴 API Backend Offline")
 
 def search_documents():
     """Function to search documents"""
@@ -405,8 +530,6 @@ def search_documents():
     
     # Search interface
     with st.container():
-        st.markdown('<div class="search-box">', unsafe_allow_html=True)
-        
         col1, col2 = st.columns([3, 1])
         
         with col1:
@@ -427,166 +550,131 @@ def search_documents():
                 limit = st.slider("Maximum results", min_value=1, max_value=20, value=10)
             with col2:
                 min_similarity = st.slider("Minimum similarity", min_value=0.0, max_value=1.0, value=0.5, step=0.05)
-        
-        st.markdown('</div>', unsafe_allow_html=True)
     
     # Perform search
     if search_button and search_query.strip():
         with st.spinner("🔍 Searching documents..."):
             try:
-                # Prepare search request
-                search_data = {
-                    "query": search_query.strip(),
-                    "limit": limit,
-                    "min_similarity": min_similarity
-                }
+                # Send search request (cached for repeated identical searches)
+                search_results = fetch_search_results(get_api_url(), search_query.strip(), limit, min_similarity)
                 
-                # Send search request
-                start_time = time.time()
-                response = requests.post(
-                    f"{get_api_url()}/search-doc",
-                    json=search_data,
-                    timeout=30
-                )
-                end_time = time.time()
+                # Display search metrics
+                col1, col2, col3, col4 = st.columns(4)
                 
-                if response.status_code == 200:
-                    search_results = response.json()
-                    
-                    # Display search metrics
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("📊 Results Found", search_results["number_of_results"])
-                    
-                    with col2:
-                        st.metric("⏱️ Response Time", f"{search_results['response_time_ms']:.1f} ms")
+                with col1:
+                    st.metric("📊 Results Found", search_results["number_of_results"])
+                
+                with col2:
+                    st.metric("⏱️ Response Time", f"{search_results['response_time_ms']:.1f} ms")
+                
+                with col3:
+                    st.metric("🎯 Min Similarity", f"{min_similarity:.2f}")
+                
+                with col4:
+                    st.metric("🔢 Max Results", limit)
+                
+                # Display results
+                if search_results["results"]:
+                    st.markdown("### 📋 Search Results")
                     
-                    with col3:
-                        st.metric("🎯 Min Similarity", f"{min_similarity:.2f}")
+                    # Build the table straight from the API results; the column
+                    # config below handles labels and score formatting
+                    results_df = pd.DataFrame(
+                        search_results["results"],
+                        columns=["document_id", "filename", "page_number", "line_number", "similarity_score", "text_fragment"]
+                    )
                     
-                    with col4:
-                        st.metric("🔢 Max Results", limit)
+                    # Configure column widths and display
+                    st.dataframe(
+                        results_df,
+                        use_container_width=True,
+                        hide_index=True,
+                        column_config={
+                            "document_id": st.column_config.TextColumn(
+                                "Document ID",
+                                width="small",
+                                help="Unique identifier for the document"
+                            ),
+                            "filename": st.column_config.TextColumn(
+                                "Filename",
+                                width="medium",
+                                help="Name of the PDF document"
+                            ),
+                            "page_number": st.column_config.NumberColumn(
+                                "Page",
+                                width="small",
+                                help="Page number in the document"
+                            ),
+                            "line_number": st.column_config.NumberColumn(
+                                "Line",
+                                width="small", 
+                                help="Line number in the document"
+                            ),
+                            "similarity_score": st.column_config.ProgressColumn(
+                                "Similarity",
+                                width="small",
+                                help="Similarity score (0.00-1.00)",
+                                format="%.2f",
+                                min_value=0,
+                                max_value=1
+                            ),
+                            "text_fragment": st.column_config.TextColumn(
+                                "Text Fragment",
+                                width="large",
+                                help="Matching text content"
+                            )
+                        }
+                    )
                     
-                    # Display results
-                    if search_results["results"]:
-                        st.markdown("### 📋 Search Results")
-                        
-                        # Create DataFrame for table display
-                        table_data = []
-                        for i, result in enumerate(search_results["results"], 1):
-                            table_data.append({
-                                "📄 Document ID": result['document_id'][:12] + "...",  # Shortened for display
-                                "📁 Name": result['filename'],
-                                "📖 Page #": result['page_number'],
-                                "📝 Line #": result['line_number'],
-                                "🎯 Score": f"{result['similarity_score']:.2f}",
-                                "📄 Text": result['text_fragment'][:100] + "..." if len(result['text_fragment']) > 100 else result['text_fragment']
-                            })
-                        
-                        # Display the table
-                        results_df = pd.DataFrame(table_data)
-                        
-                        # Configure column widths and display
-                        st.dataframe(
-                            results_df,
-                            use_container_width=True,
-                            hide_index=True,
-                            column_config={
-                                "📄 Document ID": st.column_config.TextColumn(
-                                    "Document ID",
-                                    width="small",
-                                    help="Unique identifier for the document"
-                                ),
-                                "📁 Name": st.column_config.TextColumn(
-                                    "Filename",
-                                    width="medium",
-                                    help="Name of the PDF document"
-                                ),
-                                "📖 Page #": st.column_config.NumberColumn(
-                                    "Page",
-                                    width="small",
-                                    help="Page number in the document"
-                                ),
-                                "📝 Line #": st.column_config.NumberColumn(
-                                    "Line",
-                                    width="small", 
-                                    help="Line number in the document"
-                                ),
-                                "🎯 Score": st.column_config.TextColumn(
-                                    "Similarity",
-                                    width="small",
-                                    help="Similarity score (0.00-1.00)"
-                                ),
-                                "📄 Text": st.column_config.TextColumn(
-                                    "Text Fragment",
-                                    width="large",
-                                    help="Matching text content"
-                                )
-                            }
+                    # Show expandable full text for detailed view
+                    with st.expander("� View Full Text Details"):
+                        selected_result = st.selectbox(
+                            "Select a result to view full text:",
+                            options=[f"Result #{i+1} - {result['filename']} (Page {result['page_number']}, Line {result['line_number']})" 
+                                    for i, result in enumerate(search_results["results"])],
+                            help="Choose a result to see the complete text fragment"
                         )
                         
-                        # Show expandable full text for detailed view
-                        with st.expander("� View Full Text Details"):
-                            selected_result = st.selectbox(
-                                "Select a result to view full text:",
-                                options=[f"Result #{i+1} - {result['filename']} (Page {result['page_number']}, Line {result['line_number']})" 
-                                        for i, result in enumerate(search_results["results"])],
-                                help="Choose a result to see the complete text fragment"
-                            )
+                        if selected_result:
+                            # Find the selected result
+                            result_index = int(selected_result.split("#")[1].split(" ")[0]) - 1
+                            selected_result_data = search_results["results"][result_index]
                             
-                            if selected_result:
-                                # Find the selected result
-                                result_index = int(selected_result.split("#")[1].split(" ")[0]) - 1
-                                selected_result_data = search_results["results"][result_index]
-                                
-                                # Display full details
-                                col1, col2 = st.columns([1, 2])
-                                
-                                with col1:
-                                    st.markdown("**� Document Details:**")
-                                    st.write(f"**Document ID:** {selected_result_data['document_id']}")
-                                    st.write(f"**Filename:** {selected_result_data['filename']}")
-                                    st.write(f"**Page:** {selected_result_data['page_number']}")
-                                    st.write(f"**Line:** {selected_result_data['line_number']}")
-                                    st.write(f"**Similarity Score:** {selected_result_data['similarity_score']:.4f}")
-                                
-                                with col2:
-                                    st.markdown("**📝 Full Text:**")
-                                    st.markdown(f"""
-                                    <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #007bff;">
-                                        {selected_result_data['text_fragment']}
-                                    </div>
-                                    """, unsafe_allow_html=True)
-                        
-                        # Export options
-                        if st.button("📥 Export Results as CSV"):
-                            # Create export DataFrame with full data
-                            export_data = []
-                            for result in search_results["results"]:
-                                export_data.append({
-                                    "document_id": result['document_id'],
-                                    "filename": result['filename'],
-                                    "page_number": result['page_number'],
-                                    "line_number": result['line_number'],
-                                    "similarity_score": f"{result['similarity_score']:.4f}",
-                                    "text_fragment": result['text_fragment']
-                                })
+                            # Display full details
+                            col1, col2 = st.columns([1, 2])
                             
-                            export_df = pd.DataFrame(export_data)
-                            csv = export_df.to_csv(index=False)
-                            st.download_button(
-                                label="⬇️ Download CSV",
-                                data=csv,
-                                file_name=f"search_results_{search_query.replace(' ', '_')}.csv",
-                                mime="text/csv"
-                            )
-                    else:
-                        st.warning(f"🔍 No results found for '{search_query}' with similarity ≥ {min_similarity:.2f}")
-                        st.info("💡 Try:\n- Different keywords\n- Lower similarity threshold\n- More general search terms")
-                
+                            # One markdown element per column instead of one per field
+                            with col1:
+                                st.markdown("\n\n".join([
+                                    "**� Document Details:**",
+                                    f"**Document ID:** {selected_result_data['document_id']}",
+                                    f"**Filename:** {selected_result_data['filename']}",
+                                    f"**Page:** {selected_result_data['page_number']}",
+                                    f"**Line:** {selected_result_data['line_number']}",
+                                    f"**Similarity Score:** {selected_result_data['similarity_score']:.4f}"
+                                ]))
+                            
+                            with col2:
+                                st.markdown(f"""
+                                **📝 Full Text:**
+                                <div style="background-color: #f8f9fa; padding: 15px; border-radius: 8px; border-left: 4px solid #007bff;">
+                                    {html.escape(selected_result_data['text_fragment'])}
+                                </div>
+                                """, unsafe_allow_html=True)
+                    
+                    # Export options
+                    st.download_button(
+                        label="📥 Export Results as CSV",
+                        data=search_results_csv(search_results["results"]),
+                        file_name=f"search_results_{search_query.replace(' ', '_')}.csv",
+                        mime="text/csv"
+                    )
                 else:
-                    st.error(f"❌ Search failed: {response.text}")
+                    st.warning(f"🔍 No results found for '{search_query}' with similarity ≥ {min_similarity:.2f}")
+                    st.info("💡 Try:\n- Different keywords\n- Lower similarity threshold\n- More general search terms")
+            
+            except requests.exceptions.HTTPError as e:
+                st.error(f"❌ Search failed: {e.response.text}")
             
             except Exception as e:
                 st.error(f"❌ Error during search: {str(e)}")
@@ -612,14 +700,16 @@ def main():
         
         # System info
         st.markdown("### ℹ️ System Info")
-        try:
-            health_response = requests.get(f"{get_api_url()}/health", timeout=5)
-            if health_response.status_code == 200:
-                st.success("🟢 API Online")
-            else:
-                st.error("🔴 API Offline")
-        except:
+        if st.button("📡 Ping API", use_container_width=True):
+            fetch_health.clear()
+        
+        health_status, _ = fetch_health(get_api_url())
+        if health_status == 200:
+            st.success("🟢 API Online")
+        elif health_status is None:
             st.error("🔴 API Unreachable")
+        else:
+            st.error("🔴 API Offline")
         
         st.markdown("---")
         st.markdown("""
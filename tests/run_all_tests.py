@@ -8,20 +8,34 @@ Similar to pytest, it provides a single command to execute the entire test suite
 
 Usage:
     python run_all_tests.py
+    python run_all_tests.py --jobs 8   # run tests concurrently
     
 Or via make:
     make test-all
 """
 
 import sys
+import os
+import argparse
 import subprocess
 import json
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TEST_TIMEOUT = 300  # 5 minute timeout per test
+
 class TestRunner:
-    def __init__(self):
+    def __init__(self, jobs=1):
+        self.jobs = max(1, jobs)
+        self.lock = threading.Lock()
         self.results = {
             "timestamp": datetime.now().isoformat(),
             "total_tests": 0,
@@ -38,77 +52,109 @@ class TestRunner:
         print("=" * 80)
         print(f"📅 Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"📂 Working directory: {self.tests_dir}")
+        print(f"⚙️  Parallel jobs: {self.jobs}")
         print("=" * 80)
         
+    def emit(self, *lines):
+        """Print lines without interleaving them with other tests' output"""
+        with self.lock:
+            for line in lines:
+                print(line, flush=True)
+    
+    def stream_output(self, process, prefix):
+        """Echo the test's stdout line by line as it arrives.
+        
+        stderr is drained on a background thread and a timer kills the test
+        once TEST_TIMEOUT passes; plain pipe reads keep this working on
+        Windows, where select() only accepts sockets.
+        
+        Returns the number of stdout lines and the collected stderr text.
+        """
+        stderr_chunks = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True
+        )
+        stderr_reader.start()
+        
+        timed_out = threading.Event()
+        def kill():
+            timed_out.set()
+            process.kill()
+        timer = threading.Timer(TEST_TIMEOUT, kill)
+        timer.start()
+        
+        stdout_lines = 0
+        try:
+            for raw_line in process.stdout:
+                stdout_lines += 1
+                self.emit(prefix + raw_line.decode("utf-8", errors="replace").removesuffix("\n"))
+        finally:
+            timer.cancel()
+        
+        process.wait()
+        stderr_reader.join()
+        if timed_out.is_set():
+            raise subprocess.TimeoutExpired(process.args, TEST_TIMEOUT)
+        return stdout_lines, b"".join(stderr_chunks).decode("utf-8", errors="replace")
+    
     def run_test(self, test_name, test_file):
-        """Run a single test and capture results"""
-        print(f"\n🧪 Running {test_name}...")
-        print("-" * 60)
+        """Run a single test and return its result"""
+        # Tag each line with its test when several run at once
+        prefix = f"[{test_file}] " if self.jobs > 1 else ""
+        self.emit(f"\n🧪 Running {test_name}...", "-" * 60)
         
         start_time = time.time()
         try:
-            # Run the test
-            result = subprocess.run(
+            # Run the test, unbuffered so its output arrives as it is printed
+            process = subprocess.Popen(
                 [sys.executable, test_file],
                 cwd=self.tests_dir,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env={**os.environ, "PYTHONUNBUFFERED": "1"}
             )
+            stdout_lines, stderr = self.stream_output(process, prefix)
             
             duration = time.time() - start_time
             
             # Determine if test passed based on return code and output
-            success = result.returncode == 0
+            success = process.returncode == 0
             
             test_result = {
                 "test_name": test_name,
                 "test_file": test_file,
                 "success": success,
                 "duration": round(duration, 2),
-                "return_code": result.returncode,
-                "stdout_lines": len(result.stdout.splitlines()) if result.stdout else 0,
-                "stderr_lines": len(result.stderr.splitlines()) if result.stderr else 0
+                "return_code": process.returncode,
+                "stdout_lines": stdout_lines,
+                "stderr_lines": stderr.count("\n") if stderr else 0
             }
             
-            # Print test output
-            if result.stdout:
-                print(result.stdout)
-            
-            if result.stderr and not success:
-                print("❌ STDERR:")
-                print(result.stderr)
+            output = []
+            if stderr and not success:
+                output.append("❌ STDERR:")
+                output.append(stderr)
             
             # Print result summary
             if success:
-                print(f"✅ {test_name} PASSED ({duration:.2f}s)")
-                self.results["passed_tests"] += 1
+                output.append(f"✅ {test_name} PASSED ({duration:.2f}s)")
             else:
-                print(f"❌ {test_name} FAILED ({duration:.2f}s)")
-                self.results["failed_tests"] += 1
-                
-            self.results["test_results"].append(test_result)
-            self.results["total_tests"] += 1
-            
-            return success
+                output.append(f"❌ {test_name} FAILED ({duration:.2f}s)")
+            self.emit(*output)
             
         except subprocess.TimeoutExpired:
-            print(f"⏰ {test_name} TIMEOUT (exceeded 5 minutes)")
+            self.emit(f"⏰ {test_name} TIMEOUT (exceeded 5 minutes)")
             test_result = {
                 "test_name": test_name,
                 "test_file": test_file,
                 "success": False,
-                "duration": 300,
+                "duration": TEST_TIMEOUT,
                 "return_code": -1,
                 "error": "Timeout"
             }
-            self.results["test_results"].append(test_result)
-            self.results["failed_tests"] += 1
-            self.results["total_tests"] += 1
-            return False
             
         except Exception as e:
-            print(f"💥 {test_name} ERROR: {str(e)}")
+            self.emit(f"💥 {test_name} ERROR: {str(e)}")
             test_result = {
                 "test_name": test_name,
                 "test_file": test_file,
@@ -117,10 +163,18 @@ class TestRunner:
                 "return_code": -1,
                 "error": str(e)
             }
+        
+        return test_result
+    
+    def record_result(self, test_result):
+        """Add a test result to the running totals"""
+        with self.lock:
+            if test_result["success"]:
+                self.results["passed_tests"] += 1
+            else:
+                self.results["failed_tests"] += 1
             self.results["test_results"].append(test_result)
-            self.results["failed_tests"] += 1
             self.results["total_tests"] += 1
-            return False
     
     def print_summary(self):
         """Print final test summary"""
@@ -156,8 +210,11 @@ class TestRunner:
             
         # Save detailed results
         results_file = self.tests_dir / "unified_test_results.json"
-        with open(results_file, 'w') as f:
-            json.dump(self.results, f, indent=2)
+        if orjson is not None:
+            results_file.write_bytes(orjson.dumps(self.results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(self.results, f, indent=2)
         
         print(f"💾 Detailed results saved to: {results_file}")
         print("=" * 80)
@@ -181,19 +238,41 @@ class TestRunner:
         ]
         
         # Run each test
+        order = {test_file: index for index, (_, test_file) in enumerate(test_suite)}
+        pending = []
         for test_name, test_file in test_suite:
             test_path = self.tests_dir / test_file
             if test_path.exists():
-                self.run_test(test_name, test_file)
+                pending.append((test_name, test_file))
             else:
                 print(f"⚠️  Skipping {test_name}: {test_file} not found")
         
+        if self.jobs == 1:
+            for test_name, test_file in pending:
+                self.record_result(self.run_test(test_name, test_file))
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.jobs, len(pending) or 1)) as executor:
+                futures = [executor.submit(self.run_test, test_name, test_file)
+                           for test_name, test_file in pending]
+                for future in as_completed(futures):
+                    self.record_result(future.result())
+        
+        # Keep the summary in suite order regardless of completion order
+        self.results["test_results"].sort(key=lambda test: order[test["test_file"]])
+        
         # Print final summary and return appropriate exit code
         return self.print_summary()
 
 def main():
     """Main entry point"""
-    runner = TestRunner()
+    parser = argparse.ArgumentParser(description="Run the PDF Search System test suite")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of tests to run concurrently (default: 1). "
+                             "Several tests clear the shared document store, so "
+                             "parallel runs can make them interfere with each other.")
+    args = parser.parse_args()
+    
+    runner = TestRunner(jobs=args.jobs)
     exit_code = runner.run_all_tests()
     sys.exit(exit_code)
 
@@ -7,7 +7,7 @@ Run all tests with a single command: python test.py
 
 This script:
 - Automatically installs missing dependencies
-- Runs all test suites sequentially
+- Runs all test suites, independent ones concurrently
 - Provides a comprehensive summary
 - Saves detailed results
 - Works out of the box with zero configuration
@@ -15,34 +15,334 @@ This script:
 Usage:
     cd tests/
     python test.py
+    python test.py --jobs 4   # run tests concurrently
+    python test.py --force    # ignore cached results of unchanged tests
+    python test.py --shard 1/2   # run half the suite (e.g. on one CI machine)
+    python test.py --merge results/run_*/test_summary.shard*.json
 
 That's it! No make, no setup, just one command.
 """
 
 import sys
+import argparse
+import asyncio
+import hashlib
 import subprocess
 import json
 import time
 import os
+import signal
+from collections import deque
 from datetime import datetime
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 
+# Seconds a timed-out test gets to exit after SIGTERM before it is killed
+TERMINATE_GRACE_PERIOD = 5
+
+# Lines of a test's output echoed to the console when it can't be shown live
+OUTPUT_TAIL_LINES = 20
+
+# Seconds between checks for new output when following a test live
+FOLLOW_INTERVAL = 0.1
+
+# Test processes skip writing .pyc files, flush output as they print it and
+# get a fixed hash seed so runs are reproducible
+TEST_ENV = {
+    **os.environ,
+    "PYTHONDONTWRITEBYTECODE": "1",
+    "PYTHONUNBUFFERED": "1",
+    "PYTHONHASHSEED": "0"
+}
+
+# CI logs and redirected output get the summary in plain ASCII
+PLAIN_OUTPUT = bool(os.environ.get("CI")) or not sys.stdout.isatty()
+
+SUMMARY_ICONS = {
+    "fancy": {
+        "rule": "🎯" * 50, "summary": "📊 ", "time": "⏱️  ", "tests": "🧪 ",
+        "passed": "✅ ", "failed": "❌ ", "skipped": "⏭️  ", "rate": "📈 ",
+        "details": "📋 ", "pass": "✅ PASS", "fail": "❌ FAIL", "saved": "💾 ",
+        "cached": "💾 CACHED", "cached_count": "💾 ",
+        "success": "🎉 SUCCESS: All tests passed! System is operational! 🎉",
+        "all_cached": "💾 CACHED: Every result is from an earlier run; no test contacted "
+                      "the services. Use --force to check the live system.",
+        "warning": "⚠️  ", "failure": "💥 "
+    },
+    "plain": {
+        "rule": "=" * 50, "summary": "", "time": "", "tests": "",
+        "passed": "", "failed": "", "skipped": "", "rate": "",
+        "details": "", "pass": "[PASS]", "fail": "[FAIL]", "saved": "",
+        "cached": "[CACHED]", "cached_count": "",
+        "success": "SUCCESS: All tests passed! System is operational!",
+        "all_cached": "CACHED: Every result is from an earlier run; no test contacted "
+                      "the services. Use --force to check the live system.",
+        "warning": "", "failure": ""
+    }
+}
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Directories that never contain code under test
+SKIP_DIRS = {".git", "__pycache__", "lancedb_data", "results", ".venv", "venv"}
+
+# Besides Python sources, the files that decide what a test exercises:
+# fixtures, requirements, and the Docker and compose configs for the services
+INPUT_SUFFIXES = (".py", ".pdf", ".txt", ".yml", ".yaml")
+
+def iter_input_files(directory):
+    """Yield DirEntries for test inputs below directory, pruning SKIP_DIRS"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    yield from iter_input_files(entry.path)
+            elif entry.name.endswith(INPUT_SUFFIXES) or entry.name.startswith("Dockerfile"):
+                yield entry
+
+def dump_json(data):
+    """Serialize to indented JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+def requirements_satisfied(requirements):
+    """Check whether every requirement is already installed at a matching version"""
+    # Imported here because it is only needed when the .deps_ok sentinel is
+    # stale, and it is the slowest import of this script
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        return False
+    
+    for line in requirements:
+        try:
+            requirement = Requirement(line)
+            if requirement.marker is not None and not requirement.marker.evaluate():
+                continue
+            if not requirement.specifier.contains(version(requirement.name), prereleases=True):
+                return False
+        except (InvalidRequirement, PackageNotFoundError):
+            return False
+    return True
+
+async def stop_process(process):
+    """Ask a test process to exit, killing it if it ignores SIGTERM"""
+    process.terminate()
+    try:
+        await asyncio.wait_for(process.wait(), timeout=TERMINATE_GRACE_PERIOD)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+
+async def follow_output(test_output_file, offset, process):
+    """Echo what a test writes to its output file until it exits, like tail -f"""
+    with open(test_output_file, 'rb') as reader:
+        reader.seek(offset)
+        while True:
+            # Check before reading so the last write is never missed
+            finished = process.returncode is not None
+            chunk = reader.read()
+            if chunk:
+                sys.stdout.buffer.write(chunk)
+                sys.stdout.buffer.flush()
+            if finished:
+                return
+            await asyncio.sleep(FOLLOW_INTERVAL)
+
+async def run_test_worker(test_name, test_file, tests_dir, test_output_file, live=False):
+    """Run a single test file.
+    
+    With live set, the test's output is echoed to the console as it is
+    written; only use that when no other test is running. Otherwise the end
+    of the output is included in the returned console text.
+    
+    Returns the test result (None if the file is missing) and the console
+    output for the test as one string, so callers can print it atomically.
+    """
+    output = [
+        f"\n{'='*60}",
+        f"🧪 RUNNING: {test_name}",
+        f"📄 File: {test_file}",
+        "="*60
+    ]
+    
+    test_path = tests_dir / test_file
+    if not test_path.exists():
+        output.append(f"⏭️  SKIPPED: {test_file} not found")
+        return None, "\n".join(output)
+    
+    if live:
+        # The header has to come before the streamed output
+        print("\n".join(output), flush=True)
+        output = []
+        
+    # The test writes straight into its output file, so nothing is held in memory
+    start_time = time.perf_counter_ns()
+    try:
+        with open(test_output_file, 'wb') as f:
+            f.write(f"Test: {test_name}\nFile: {test_file}\n{'='*60}\nOUTPUT:\n".encode())
+            f.flush()
+            output_start = f.tell()
+            
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, test_file,
+                cwd=tests_dir,
+                env=TEST_ENV,
+                stdout=f,
+                stderr=asyncio.subprocess.STDOUT
+            )
+            follower = None
+            if live:
+                follower = asyncio.create_task(follow_output(test_output_file, output_start, process))
+            try:
+                await asyncio.wait_for(
+                    process.wait(),
+                    timeout=300  # 5 minute timeout per test
+                )
+            except asyncio.TimeoutError:
+                await stop_process(process)
+                raise
+            finally:
+                if follower is not None:
+                    await follower
+            
+            duration = (time.perf_counter_ns() - start_time) / 1e9
+            success = process.returncode == 0
+            
+            # The child shares our file offset, so this is the size of its output
+            output_size = f.tell() - output_start
+            
+            # Keep the end of the output, where a failure usually shows up
+            tail = ""
+            if output_size and not (live and success):
+                with open(test_output_file, 'rb') as reader:
+                    reader.seek(output_start)
+                    tail = b"".join(deque(reader, maxlen=OUTPUT_TAIL_LINES)).decode(errors="replace")
+            
+            if not output_size:
+                f.write(b"(no output)\n")
+            f.write(
+                f"\n{'='*60}\nDuration: {duration:.2f}s\n"
+                f"Return Code: {process.returncode}\nSuccess: {success}\n".encode()
+            )
+        
+        # Create test result record
+        test_result = {
+            "test_name": test_name,
+            "test_file": test_file,
+            "success": success,
+            "duration": round(duration, 2),
+            "return_code": process.returncode,
+            "has_output": output_size > 0,
+            "output_file": str(test_output_file)
+        }
+        
+        output.append(f"📄 Output: {test_output_file}")
+        if tail and not live:
+            marker = "📝" if success else "❌"
+            output.append(f"\n{marker} OUTPUT (last {OUTPUT_TAIL_LINES} lines):\n{tail.rstrip()}")
+        if tail and not success:
+            test_result["output_tail"] = tail
+        
+        # Print result
+        status_emoji = "✅" if success else "❌"
+        status_text = "PASSED" if success else "FAILED"
+        output.append(f"\n{status_emoji} {test_name} {status_text} ({duration:.2f}s)")
+        
+    except asyncio.TimeoutError:
+        output.append(f"⏰ TIMEOUT: {test_name} (exceeded 5 minutes)")
+        
+        test_result = {
+            "test_name": test_name,
+            "test_file": test_file,
+            "success": False,
+            "duration": 300,
+            "return_code": -1,
+            "error": "Timeout",
+            "output_file": str(test_output_file)
+        }
+        
+    except Exception as e:
+        duration = (time.perf_counter_ns() - start_time) / 1e9
+        output.append(f"💥 ERROR: {test_name} - {str(e)}")
+        
+        test_result = {
+            "test_name": test_name,
+            "test_file": test_file,
+            "success": False,
+            "duration": round(duration, 2),
+            "return_code": -1,
+            "error": str(e)
+        }
+    
+    return test_result, "\n".join(output)
+
 class OneCommandTestSuite:
-    def __init__(self):
+    # All available tests, in execution order
+    TEST_SUITE = [
+        ("Quick Comprehensive Test", "test_quick.py"),
+        ("Simple Validation Test", "test_simple.py"),
+        ("Advanced Performance Test", "test_advanced.py"),
+        ("System Integration Test", "test_system.py"),
+        ("Comprehensive Professional Test", "test_comprehensive.py"),
+        ("Table PDF Processing", "test_table_pdf.py"),
+        ("Table Simple Functionality", "test_table_simple.py"),
+        ("Table Validation", "test_table_validation.py")
+    ]
+    
+    # Groups run one after another; tests within a group run concurrently.
+    # Tests that delete all documents get a group of their own so they can't
+    # wipe data another test has just uploaded.
+    TEST_GROUPS = [
+        ["test_quick.py"],
+        ["test_simple.py"],
+        ["test_advanced.py"],
+        ["test_comprehensive.py"],
+        ["test_system.py", "test_table_pdf.py", "test_table_simple.py", "test_table_validation.py"]
+    ]
+    
+    def __init__(self, jobs=1, use_cache=True, shard=None):
+        self.jobs = max(1, jobs)
+        self.use_cache = use_cache
+        self.shard = shard  # (index, count), 1-based, or None for the whole suite
+        self.interrupted = None  # asyncio.Event, created on the running loop
         # Create results directory structure
         self.tests_dir = Path(__file__).parent
         self.results_base_dir = self.tests_dir / "results"
         
         # Create timestamp-based run directory
-        run_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # One wall-clock reading names the run and dates everything it writes;
+        # durations use the monotonic perf counter
+        self.started_at = datetime.now()
+        run_timestamp = self.started_at.strftime("%Y%m%d_%H%M%S")
         self.run_dir = self.results_base_dir / f"run_{run_timestamp}"
         
         # Create directories
         self.results_base_dir.mkdir(exist_ok=True)
         self.run_dir.mkdir(exist_ok=True)
         
+        # Per-test output files, built once instead of on every run
+        self._output_paths = {
+            test_file: self.run_dir / f"{test_file[:-3]}_output.txt"
+            for _, test_file in self.TEST_SUITE
+        }
+        
+        # Results of passing tests from earlier runs, keyed by _cache_key
+        self.cache_file = self.results_base_dir / "cache.json"
+        self.cache = {}
+        self.source_digest = None
+        if use_cache and self.cache_file.exists():
+            try:
+                self.cache = json.loads(self.cache_file.read_text())
+            except (OSError, ValueError):
+                self.cache = {}
+        
         self.results = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": self.started_at.isoformat(),
             "run_id": f"run_{run_timestamp}",
             "run_directory": str(self.run_dir),
             "total_tests": 0,
@@ -63,7 +363,7 @@ class OneCommandTestSuite:
         print("\n" + "🚀" * 40)
         print("🧪 PDF SEARCH SYSTEM - ONE COMMAND TEST SUITE 🧪")
         print("🚀" * 40)
-        print(f"📅 Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        print(f"📅 Started: {self.started_at.strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"🐍 Python: {sys.version.split()[0]}")
         print(f"📂 Directory: {self.tests_dir}")
         print(f"📊 Results: {self.run_dir}")
@@ -86,6 +386,22 @@ class OneCommandTestSuite:
             if not requirements:
                 print("✅ No dependencies required")
                 return
+            
+            # Skip pip entirely when these exact requirements were already
+            # satisfied for this interpreter; another venv or Python gets its
+            # own hash and is checked again
+            requirements_hash = hashlib.sha256(
+                f"{sys.executable}\n{sys.version}\n".encode() + requirements_file.read_bytes()
+            ).hexdigest()
+            sentinel_file = self.results_base_dir / ".deps_ok"
+            if sentinel_file.exists() and sentinel_file.read_text().strip() == requirements_hash:
+                print("✅ Dependencies unchanged since last check")
+                return
+            
+            if requirements_satisfied(requirements):
+                print("✅ All dependencies already installed")
+                sentinel_file.write_text(requirements_hash)
+                return
                 
             print(f"📦 Installing {len(requirements)} dependencies...")
             result = subprocess.run(
@@ -96,6 +412,7 @@ class OneCommandTestSuite:
             
             if result.returncode == 0:
                 print("✅ Dependencies installed successfully")
+                sentinel_file.write_text(requirements_hash)
             else:
                 print("⚠️  Some dependencies may have failed to install, continuing anyway...")
                 
@@ -103,117 +420,82 @@ class OneCommandTestSuite:
             print(f"⚠️  Dependency installation failed: {e}")
             print("Continuing with tests anyway...")
 
-    def run_single_test(self, test_name, test_file):
-        """Run a single test file"""
-        print(f"\n{'='*60}")
-        print(f"🧪 RUNNING: {test_name}")
-        print(f"📄 File: {test_file}")
-        print("="*60)
-        
-        test_path = self.tests_dir / test_file
-        if not test_path.exists():
-            print(f"⏭️  SKIPPED: {test_file} not found")
+    def compute_source_digest(self):
+        """Digest every test input in the repository.
+        
+        Python files are fingerprinted by size and mtime, which is cheap.
+        Other inputs are hashed by content, because some tests rewrite their
+        fixtures with identical bytes on every run. Any edit to the services'
+        code, requirements, Dockerfiles or compose config, or to the tests and
+        their fixtures, changes the digest and invalidates the result cache.
+        """
+        repo_root = self.tests_dir.parent
+        manifest = []
+        for entry in iter_input_files(repo_root):
+            if entry.name.endswith(".py"):
+                stat = entry.stat()
+                fingerprint = f"{stat.st_size}:{stat.st_mtime_ns}"
+            else:
+                fingerprint = hashlib.blake2b(Path(entry.path).read_bytes()).hexdigest()
+            manifest.append(f"{os.path.relpath(entry.path, repo_root)}:{fingerprint}\n")
+        return hashlib.sha256("".join(sorted(manifest)).encode()).hexdigest()
+    
+    def _cache_key(self, test_file):
+        """Key a test's cached result by the test and the source tree state"""
+        return f"{test_file}:{self.source_digest}"
+    
+    async def run_single_test(self, test_name, test_file, slots):
+        """Run a single test file once a slot is free and fold in its result"""
+        cache_key = None
+        if self.use_cache and (self.tests_dir / test_file).exists():
+            cache_key = self._cache_key(test_file)
+            cached_result = self.cache.get(cache_key)
+            if cached_result is not None:
+                print(f"\n✅ CACHED: {test_name} passed on an earlier run with the same sources")
+                self.record_result({**cached_result, "cached": True})
+                return
+        
+        async with slots:
+            if self.interrupted.is_set():
+                print(f"\n⏭️  SKIPPED: {test_name} (run interrupted)")
+                self.record_result(None)
+                return
+            test_result, output = await run_test_worker(
+                test_name, test_file, self.tests_dir, self._output_paths[test_file],
+                live=self.jobs == 1
+            )
+        
+        # Print the whole block at once so parallel runs don't interleave
+        print(output)
+        self.record_result(test_result)
+        
+        # Only passing results are reused; failures are often the services
+        # being down rather than the code, so they always run again
+        if cache_key is not None and test_result is not None and test_result["success"]:
+            self.cache[cache_key] = test_result
+    
+    def interrupt(self):
+        """Handle Ctrl+C: stop dispatching tests and restore default handling"""
+        print("\n🛑 Interrupted - waiting for running tests, skipping the rest "
+              "(press Ctrl+C again to abort)")
+        self.interrupted.set()
+        self.results["interrupted"] = True
+        asyncio.get_running_loop().remove_signal_handler(signal.SIGINT)
+    
+    def record_result(self, test_result):
+        """Add a finished (or skipped) test to the running totals"""
+        if test_result is None:
             self.results["skipped_tests"] += 1
             return
-            
-        start_time = time.time()
-        try:
-            result = subprocess.run(
-                [sys.executable, test_file],
-                cwd=self.tests_dir,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout per test
-            )
-            
-            duration = time.time() - start_time
-            self.results["total_duration"] += duration
-            
-            # Print the test output in real-time style
-            if result.stdout:
-                print(result.stdout)
-                
-            success = result.returncode == 0
-            
-            # Save individual test output to file
-            test_output_file = self.run_dir / f"{test_file.replace('.py', '')}_output.txt"
-            with open(test_output_file, 'w') as f:
-                f.write(f"Test: {test_name}\n")
-                f.write(f"File: {test_file}\n")
-                f.write(f"Duration: {duration:.2f}s\n")
-                f.write(f"Return Code: {result.returncode}\n")
-                f.write(f"Success: {success}\n")
-                f.write("="*60 + "\n")
-                f.write("STDOUT:\n")
-                f.write(result.stdout or "(no output)\n")
-                if result.stderr:
-                    f.write("\nSTDERR:\n")
-                    f.write(result.stderr)
-            
-            # Create test result record
-            test_result = {
-                "test_name": test_name,
-                "test_file": test_file,
-                "success": success,
-                "duration": round(duration, 2),
-                "return_code": result.returncode,
-                "has_output": bool(result.stdout),
-                "has_errors": bool(result.stderr),
-                "output_file": str(test_output_file)
-            }
-            
-            if result.stderr and not success:
-                print(f"\n❌ ERRORS:\n{result.stderr}")
-                test_result["stderr"] = result.stderr
-            
-            # Print result
-            status_emoji = "✅" if success else "❌"
-            status_text = "PASSED" if success else "FAILED"
-            print(f"\n{status_emoji} {test_name} {status_text} ({duration:.2f}s)")
-            
-            if success:
-                self.results["passed_tests"] += 1
-            else:
-                self.results["failed_tests"] += 1
-                
-            self.results["test_results"].append(test_result)
-            self.results["total_tests"] += 1
-            
-        except subprocess.TimeoutExpired:
-            duration = 300
-            self.results["total_duration"] += duration
-            print(f"⏰ TIMEOUT: {test_name} (exceeded 5 minutes)")
-            
-            test_result = {
-                "test_name": test_name,
-                "test_file": test_file,
-                "success": False,
-                "duration": duration,
-                "return_code": -1,
-                "error": "Timeout"
-            }
-            
-            self.results["test_results"].append(test_result)
-            self.results["failed_tests"] += 1
-            self.results["total_tests"] += 1
-            
-        except Exception as e:
-            duration = time.time() - start_time
-            self.results["total_duration"] += duration
-            print(f"💥 ERROR: {test_name} - {str(e)}")
-            
-            test_result = {
-                "test_name": test_name,
-                "test_file": test_file,
-                "success": False,
-                "duration": round(duration, 2),
-                "return_code": -1,
-                "error": str(e)
-            }
-            
-            self.results["test_results"].append(test_result)
+        
+        if not test_result.get("cached"):
+            self.results["total_duration"] += test_result["duration"]
+        if test_result["success"]:
+            self.results["passed_tests"] += 1
+        else:
             self.results["failed_tests"] += 1
-            self.results["total_tests"] += 1
+        self.results["test_results"].append(test_result)
+        self.results["total_tests"] += 1
 
     def print_final_summary(self):
         """Print beautiful final summary"""
@@ -222,127 +504,210 @@ class OneCommandTestSuite:
         failed = self.results["failed_tests"]
         skipped = self.results["skipped_tests"]
         duration = self.results["total_duration"]
+        cached = sum(1 for test in self.results["test_results"] if test.get("cached"))
         
-        print("\n" + "🎯" * 50)
-        print("📊 FINAL TEST SUMMARY")
-        print("🎯" * 50)
-        
-        print(f"⏱️  Total Time:    {duration:.2f} seconds")
-        print(f"🧪 Total Tests:    {total}")
-        print(f"✅ Passed:         {passed}")
-        print(f"❌ Failed:         {failed}")
-        print(f"⏭️  Skipped:        {skipped}")
+        # Build the whole summary first and write it out in one go
+        icons = SUMMARY_ICONS["plain" if PLAIN_OUTPUT else "fancy"]
+        buf = [
+            "\n" + icons["rule"],
+            f"{icons['summary']}FINAL TEST SUMMARY",
+            icons["rule"],
+            f"{icons['time']}{'Total Time:':<16}{duration:.2f} seconds",
+            f"{icons['tests']}{'Total Tests:':<16}{total}",
+            f"{icons['passed']}{'Passed:':<16}{passed}",
+            f"{icons['failed']}{'Failed:':<16}{failed}",
+            f"{icons['skipped']}{'Skipped:':<16}{skipped}"
+        ]
+        if cached:
+            buf.append(f"{icons['cached_count']}{'Cached:':<16}{cached}")
         
         if total > 0:
             success_rate = (passed / total) * 100
-            print(f"📈 Success Rate:   {success_rate:.1f}%")
+            buf.append(f"{icons['rate']}{'Success Rate:':<16}{success_rate:.1f}%")
         
-        print("\n📋 DETAILED RESULTS:")
-        print("-" * 50)
+        buf.append(f"\n{icons['details']}DETAILED RESULTS:")
+        buf.append("-" * 50)
         
         for i, test in enumerate(self.results["test_results"], 1):
-            status = "✅ PASS" if test["success"] else "❌ FAIL"
+            if test.get("cached"):
+                status = icons["cached"]
+            else:
+                status = icons["pass"] if test["success"] else icons["fail"]
             name = test["test_name"][:30]  # Truncate long names
-            duration = test["duration"]
-            print(f"{i:2d}. {status} {name:<30} ({duration:>6.2f}s)")
+            buf.append(f"{i:2d}. {status} {name:<30} ({test['duration']:>6.2f}s)")
         
-        print("-" * 50)
+        buf.append("-" * 50)
         
         # Overall status
-        if failed == 0 and total > 0:
-            print("🎉 SUCCESS: All tests passed! System is operational! 🎉")
+        if self.results.get("interrupted"):
+            buf.append(f"{icons['warning']}INTERRUPTED: {skipped} test(s) were not run!")
+            exit_code = 1
+        elif failed == 0 and total > 0 and cached == total:
+            # Nothing was actually run, so don't claim the system is up
+            buf.append(icons["all_cached"])
+            exit_code = 0
+        elif failed == 0 and total > 0:
+            buf.append(icons["success"])
             exit_code = 0
         elif total == 0:
-            print("⚠️  WARNING: No tests were run!")
+            buf.append(f"{icons['warning']}WARNING: No tests were run!")
             exit_code = 1
         else:
-            print(f"💥 FAILURE: {failed} test(s) failed!")
+            buf.append(f"{icons['failure']}FAILURE: {failed} test(s) failed!")
             exit_code = 1
         
         # Save comprehensive results to run directory
-        summary_file = self.run_dir / "test_summary.json"
+        if self.shard is not None:
+            summary_file = self.run_dir / f"test_summary.shard{self.shard[0]}.json"
+        else:
+            summary_file = self.run_dir / "test_summary.json"
         detailed_file = self.run_dir / "test_detailed_results.txt"
+        payload = None  # Serialized once; the legacy file links to it
         
         try:
             # Save JSON results
-            with open(summary_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            payload = dump_json(self.results)
+            summary_file.write_bytes(payload)
             
-            # Save detailed text summary
-            with open(detailed_file, 'w') as f:
-                f.write("PDF SEARCH SYSTEM - TEST RUN SUMMARY\n")
-                f.write("="*60 + "\n")
-                f.write(f"Run Date: {time.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Run Directory: {self.run_dir}\n\n")
-                
-                f.write("OVERALL RESULTS:\n")
-                f.write(f"Total Time:    {duration:.2f} seconds\n")
-                f.write(f"Total Tests:   {total}\n")
-                f.write(f"Passed:        {passed}\n")
-                f.write(f"Failed:        {failed}\n")
-                f.write(f"Skipped:       {skipped}\n")
-                
-                if total > 0:
-                    success_rate = (passed / total) * 100
-                    f.write(f"Success Rate:  {success_rate:.1f}%\n")
-                
-                f.write("\n" + "="*60 + "\n")
-                f.write("DETAILED TEST RESULTS:\n")
-                f.write("="*60 + "\n")
-                
-                for i, test in enumerate(self.results["test_results"], 1):
+            # Save detailed text summary, assembled first and written once
+            lines = [
+                "PDF SEARCH SYSTEM - TEST RUN SUMMARY\n",
+                "="*60 + "\n",
+                f"Run Date: {self.started_at.strftime('%Y-%m-%d %H:%M:%S')}\n",
+                f"Run Directory: {self.run_dir}\n\n",
+                "OVERALL RESULTS:\n",
+                f"Total Time:    {duration:.2f} seconds\n",
+                f"Total Tests:   {total}\n",
+                f"Passed:        {passed}\n",
+                f"Failed:        {failed}\n",
+                f"Skipped:       {skipped}\n"
+            ]
+            if cached:
+                lines.append(f"Cached:        {cached}\n")
+            
+            if total > 0:
+                success_rate = (passed / total) * 100
+                lines.append(f"Success Rate:  {success_rate:.1f}%\n")
+            
+            lines.append("\n" + "="*60 + "\nDETAILED TEST RESULTS:\n" + "="*60 + "\n")
+            
+            for i, test in enumerate(self.results["test_results"], 1):
+                if test.get("cached"):
+                    status = "CACHED (passed on an earlier run with the same sources)"
+                else:
                     status = "PASS" if test["success"] else "FAIL"
-                    f.write(f"\n{i}. {test['test_name']}\n")
-                    f.write(f"   File: {test['test_file']}\n")
-                    f.write(f"   Status: {status}\n")
-                    f.write(f"   Duration: {test['duration']:.2f}s\n")
-                    f.write(f"   Return Code: {test['return_code']}\n")
-                    if 'output_file' in test:
-                        f.write(f"   Output File: {test['output_file']}\n")
-                    if 'error' in test:
-                        f.write(f"   Error: {test['error']}\n")
-                    f.write("   " + "-"*50 + "\n")
+                lines.append(
+                    f"\n{i}. {test['test_name']}\n"
+                    f"   File: {test['test_file']}\n"
+                    f"   Status: {status}\n"
+                    f"   Duration: {test['duration']:.2f}s\n"
+                    f"   Return Code: {test['return_code']}\n"
+                )
+                if 'output_file' in test:
+                    lines.append(f"   Output File: {test['output_file']}\n")
+                if 'error' in test:
+                    lines.append(f"   Error: {test['error']}\n")
+                lines.append("   " + "-"*50 + "\n")
+            
+            detailed_file.write_text("".join(lines))
             
-            print(f"💾 Results saved to: {self.run_dir}")
-            print(f"📊 Summary: {summary_file}")
-            print(f"📋 Details: {detailed_file}")
+            buf.append(f"{icons['saved']}Results saved to: {self.run_dir}")
+            buf.append(f"{icons['summary']}Summary: {summary_file}")
+            buf.append(f"{icons['details']}Details: {detailed_file}")
             
         except Exception as e:
-            print(f"⚠️  Could not save results: {e}")
+            buf.append(f"{icons['warning']}Could not save results: {e}")
         
         # Also save legacy results file for backwards compatibility
         legacy_results_file = self.tests_dir / "complete_test_results.json"
         try:
-            with open(legacy_results_file, 'w') as f:
-                json.dump(self.results, f, indent=2)
+            if payload is None:
+                legacy_results_file.write_bytes(dump_json(self.results))
+            else:
+                # Same content as the run's summary, so share its inode
+                legacy_results_file.unlink(missing_ok=True)
+                try:
+                    os.link(summary_file, legacy_results_file)
+                except OSError:
+                    legacy_results_file.write_bytes(payload)
         except Exception:
             pass  # Non-critical
         
-        print("🎯" * 50)
+        buf.append(icons["rule"])
+        sys.stdout.write("\n".join(buf) + "\n")
         return exit_code
 
-    def run_all_tests(self):
+    def sort_results(self):
+        """Keep the summary in suite order regardless of completion order"""
+        order = {test_file: index for index, (_, test_file) in enumerate(self.TEST_SUITE)}
+        self.results["test_results"].sort(key=lambda test: order.get(test["test_file"], len(order)))
+    
+    def merge_results(self, summary_files):
+        """Combine shard summaries into one report for this run"""
+        print(f"🧩 Merging {len(summary_files)} shard summaries...")
+        for summary_file in summary_files:
+            shard_results = json.loads(Path(summary_file).read_text())
+            for key in ("total_tests", "passed_tests", "failed_tests", "skipped_tests", "total_duration"):
+                self.results[key] += shard_results.get(key, 0)
+            self.results["test_results"].extend(shard_results.get("test_results", []))
+            if shard_results.get("interrupted"):
+                self.results["interrupted"] = True
+        
+        self.results["merged_from"] = [str(summary_file) for summary_file in summary_files]
+        self.sort_results()
+        return self.print_final_summary()
+    
+    async def run_all_tests(self):
         """Run the complete test suite"""
         self.print_banner()
         self.check_and_install_dependencies()
         
-        # Define all available tests
-        test_suite = [
-            ("Quick Comprehensive Test", "test_quick.py"),
-            ("Simple Validation Test", "test_simple.py"),
-            ("Advanced Performance Test", "test_advanced.py"),
-            ("System Integration Test", "test_system.py"),
-            ("Comprehensive Professional Test", "test_comprehensive.py"),
-            ("Table PDF Processing", "test_table_pdf.py"),
-            ("Table Simple Functionality", "test_table_simple.py"),
-            ("Table Validation", "test_table_validation.py")
-        ]
+        test_suite = self.TEST_SUITE
+        if self.shard is not None:
+            shard_index, shard_count = self.shard
+            test_suite = [
+                test for position, test in enumerate(self.TEST_SUITE)
+                if position % shard_count == shard_index - 1
+            ]
+            self.results["shard"] = f"{shard_index}/{shard_count}"
+            print(f"🧩 Shard {shard_index}/{shard_count}")
         
         print(f"\n🚀 Starting {len(test_suite)} test suites...\n")
         
-        # Run each test
-        for test_name, test_file in test_suite:
-            self.run_single_test(test_name, test_file)
+        # Run each group in turn; the semaphore bounds how many tests of a
+        # group run at once and, being FIFO, keeps suite order when --jobs is 1
+        if self.jobs > 1:
+            print(f"⚙️  Running up to {self.jobs} tests in parallel")
+        if self.use_cache:
+            self.source_digest = self.compute_source_digest()
+        test_names = {test_file: test_name for test_name, test_file in test_suite}
+        
+        # First Ctrl+C lets running tests finish but starts no new ones;
+        # a second one interrupts as usual
+        self.interrupted = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGINT, self.interrupt)
+        except (NotImplementedError, RuntimeError):
+            pass  # No signal handlers on this platform's event loop
+        
+        slots = asyncio.Semaphore(self.jobs)
+        for group in self.TEST_GROUPS:
+            await asyncio.gather(*(
+                self.run_single_test(test_names[test_file], test_file, slots)
+                for test_file in group if test_file in test_names
+            ))
+        
+        self.sort_results()
+        
+        if self.use_cache:
+            # Entries for older source trees can never hit again, so drop them
+            current = {key: result for key, result in self.cache.items()
+                       if key.endswith(f":{self.source_digest}")}
+            try:
+                self.cache_file.write_bytes(dump_json(current))
+            except OSError:
+                pass  # Non-critical
         
         # Print final summary and exit
         return self.print_final_summary()
@@ -355,9 +720,36 @@ def main():
         print(f"📂 Changing to tests directory: {script_dir}")
         os.chdir(script_dir)
     
+    parser = argparse.ArgumentParser(description="Run the complete PDF Search System test suite")
+    parser.add_argument("--jobs", "-j", type=int,
+                        default=min(len(OneCommandTestSuite.TEST_SUITE), os.cpu_count() or 1),
+                        help="Maximum number of tests to run concurrently within a group "
+                             "(default: number of CPUs). Use 1 to run strictly in order.")
+    parser.add_argument("--force", action="store_true",
+                        help="Run every test even if it passed before with unchanged sources")
+    parser.add_argument("--shard", metavar="I/N",
+                        help="Run only the I-th of N slices of the suite (e.g. 2/4), "
+                             "for spreading a run over several CI machines")
+    parser.add_argument("--merge", nargs="+", metavar="SUMMARY",
+                        help="Combine test_summary.shard*.json files from sharded runs "
+                             "into one report instead of running tests")
+    args = parser.parse_args()
+    
+    shard = None
+    if args.shard:
+        try:
+            shard = tuple(int(part) for part in args.shard.split("/"))
+            if len(shard) != 2 or not 1 <= shard[0] <= shard[1]:
+                raise ValueError
+        except ValueError:
+            parser.error(f"--shard must look like I/N with 1 <= I <= N, got {args.shard!r}")
+    
     # Run the test suite
-    test_suite = OneCommandTestSuite()
-    exit_code = test_suite.run_all_tests()
+    test_suite = OneCommandTestSuite(jobs=args.jobs, use_cache=not args.force, shard=shard)
+    if args.merge:
+        exit_code = test_suite.merge_results(args.merge)
+    else:
+        exit_code = asyncio.run(test_suite.run_all_tests())
     sys.exit(exit_code)
 
 if __name__ == "__main__":
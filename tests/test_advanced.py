@@ -15,19 +15,17 @@ import sys
 import time
 import subprocess
 import tempfile
-import urllib.request
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
 
+import requests
+from requests.adapters import HTTPAdapter
 
-class PDFTestDataGenerator:
-    """Generate test PDF files without external dependencies"""
-    
-    @staticmethod
-    def create_simple_pdf(filename: str, text_content: str) -> str:
-        """Create a simple PDF using basic PDF structure"""
-        # This creates a minimal PDF with text content
-        pdf_content = f"""%PDF-1.4
+# Independent uploads and searches are sent this many at a time
+MAX_PARALLEL_REQUESTS = 4
+
+# Minimal one-page PDF, split around the page text so only the text varies per file
+_PDF_PREFIX, _PDF_SUFFIX = b"""%PDF-1.4
 1 0 obj
 <<
 /Type /Catalog
@@ -93,42 +91,68 @@ trailer
 >>
 startxref
 453
-%%EOF"""
-        
-        with open(filename, 'w') as f:
-            f.write(pdf_content)
+%%EOF""".split(b"{text_content}")
+
+
+class PDFTestDataGenerator:
+    """Generate test PDF files without external dependencies"""
+    
+    @staticmethod
+    def create_simple_pdf(filename: str, text_content: str) -> str:
+        """Create a simple PDF using basic PDF structure"""
+        with open(filename, 'wb') as f:
+            f.write(_PDF_PREFIX)
+            f.write(text_content.encode())
+            f.write(_PDF_SUFFIX)
         return filename
 
 
 class MultipartEncoder:
-    """Simple multipart form data encoder for file uploads"""
+    """Simple multipart form data encoder for file uploads.
+    
+    Files are read in chunks while the body is sent, so an upload never has
+    to fit in memory.
+    """
+    
+    CHUNK_SIZE = 64 * 1024
     
     def __init__(self):
         self.boundary = "----WebKitFormBoundary" + "".join([str(i) for i in range(16)])
-        self.data = []
+        self._boundary_line = b"--" + self.boundary.encode() + b"\r\n"
+        # In-memory bytes are written straight into _buf; open files split it into segments
+        self._buf = bytearray()
+        self._segments = []
     
     def add_field(self, name: str, value: str):
         """Add a form field"""
-        self.data.append(f"--{self.boundary}")
-        self.data.append(f'Content-Disposition: form-data; name="{name}"')
-        self.data.append("")
-        self.data.append(value)
+        self._buf += self._boundary_line
+        self._buf += b'Content-Disposition: form-data; name="' + name.encode() + b'"\r\n\r\n'
+        self._buf += value.encode()
+        self._buf += b"\r\n"
     
-    def add_file(self, name: str, filename: str, content: bytes, content_type: str = "application/pdf"):
-        """Add a file field"""
-        self.data.append(f"--{self.boundary}")
-        self.data.append(f'Content-Disposition: form-data; name="{name}"; filename="{filename}"')
-        self.data.append(f"Content-Type: {content_type}")
-        self.data.append("")
-        # For binary data, we'll need to handle this differently
-        self.data.append(content.decode('latin-1'))  # Encode binary as latin-1 for transport
+    def add_file(self, name: str, filename: str, fileobj, content_type: str = "application/pdf"):
+        """Add a file field read from an open binary file"""
+        self._buf += self._boundary_line
+        self._buf += b'Content-Disposition: form-data; name="' + name.encode() + b'"; filename="' + filename.encode() + b'"\r\n'
+        self._buf += b"Content-Type: " + content_type.encode() + b"\r\n\r\n"
+        self._segments.append(self._buf)
+        self._segments.append(fileobj)
+        self._buf = bytearray(b"\r\n")
+    
+    def _iter_body(self):
+        for segment in self._segments:
+            if isinstance(segment, bytearray):
+                yield segment
+            else:
+                while chunk := segment.read(self.CHUNK_SIZE):
+                    yield chunk
     
     def encode(self) -> tuple:
-        """Encode the multipart data"""
-        self.data.append(f"--{self.boundary}--")
-        body = "\r\n".join(self.data)
+        """Encode the multipart data as an iterator of body chunks"""
+        self._buf += b"--" + self.boundary.encode() + b"--\r\n"
+        self._segments.append(self._buf)
         content_type = f"multipart/form-data; boundary={self.boundary}"
-        return body.encode('latin-1'), content_type
+        return self._iter_body(), content_type
 
 
 class AdvancedTestSuite:
@@ -143,6 +167,21 @@ class AdvancedTestSuite:
         self.api_base = "http://localhost:8000"
         self.vector_base = "http://localhost:8001"
         self.ui_base = "http://localhost:8501"
+        
+        # One keep-alive session so requests to the same services reuse connections
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=0))
+        
+        # Readiness endpoints, built once and polled over the session's pool
+        self._health_urls = [
+            ("API Backend", f"{self.api_base}/docs"),
+            ("Vector Store", f"{self.vector_base}/docs"),
+            ("Streamlit UI", f"{self.ui_base}")
+        ]
+        
+        # Fixed parts of every search request; only the query text changes
+        self._search_url = f"{self.api_base}/search"
+        self._search_headers = {"Content-Type": "application/json"}
     
     def log(self, message: str, level: str = "INFO"):
         """Enhanced logging with timestamps"""
@@ -156,36 +195,29 @@ class AdvancedTestSuite:
         }.get(level, "  ")
         print(f"[{timestamp}] {prefix} {message}")
     
-    def make_request(self, method: str, url: str, data: bytes = None, headers: Dict = None) -> Dict[str, Any]:
+    def make_request(self, method: str, url: str, data=None, headers: Dict = None) -> Dict[str, Any]:
         """Make HTTP request with proper error handling"""
         try:
-            req = urllib.request.Request(url, data=data, headers=headers or {})
-            req.get_method = lambda: method
+            response = self.session.request(method, url, data=data, headers=headers, timeout=30)
             
-            with urllib.request.urlopen(req, timeout=30) as response:
-                response_data = response.read()
-                try:
-                    return {
-                        "success": True,
-                        "status_code": response.status,
-                        "data": json.loads(response_data.decode('utf-8')),
-                        "headers": dict(response.headers)
-                    }
-                except json.JSONDecodeError:
-                    return {
-                        "success": True,
-                        "status_code": response.status,
-                        "data": response_data.decode('utf-8'),
-                        "headers": dict(response.headers)
-                    }
-        
-        except urllib.error.HTTPError as e:
-            error_data = e.read().decode('utf-8') if e.fp else str(e)
+            if response.status_code >= 400:
+                return {
+                    "success": False,
+                    "status_code": response.status_code,
+                    "error": response.text
+                }
+            
+            try:
+                response_data = response.json()
+            except ValueError:
+                response_data = response.text
             return {
-                "success": False,
-                "status_code": e.code,
-                "error": error_data
+                "success": True,
+                "status_code": response.status_code,
+                "data": response_data,
+                "headers": dict(response.headers)
             }
+        
         except Exception as e:
             return {
                 "success": False,
@@ -196,15 +228,14 @@ class AdvancedTestSuite:
         """Upload a file using multipart form data"""
         try:
             with open(file_path, 'rb') as f:
-                file_content = f.read()
-            
-            encoder = MultipartEncoder()
-            encoder.add_file("file", os.path.basename(file_path), file_content)
-            
-            body, content_type = encoder.encode()
-            headers = {"Content-Type": content_type}
-            
-            return self.make_request("POST", f"{self.api_base}/upload-pdf", body, headers)
+                encoder = MultipartEncoder()
+                encoder.add_file("file", os.path.basename(file_path), f)
+                
+                # The body is a generator, so requests sends it chunked as it is read
+                body, content_type = encoder.encode()
+                headers = {"Content-Type": content_type}
+                
+                return self.make_request("POST", f"{self.api_base}/upload-pdf", body, headers)
         
         except Exception as e:
             return {
@@ -212,6 +243,27 @@ class AdvancedTestSuite:
                 "error": f"Upload failed: {str(e)}"
             }
     
+    def wait_for(self, condition, max_wait: float) -> bool:
+        """Poll condition with exponential backoff until it holds or max_wait seconds pass"""
+        deadline = time.monotonic() + max_wait
+        delay = 0.25
+        
+        while True:
+            if condition():
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, 2.0)
+    
+    def documents_ready(self) -> bool:
+        """Check that the backend can list documents, i.e. the vector store is reachable"""
+        try:
+            return self.session.get(f"{self.api_base}/documents", timeout=2).status_code == 200
+        except requests.RequestException:
+            return False
+    
     def run_system_startup_tests(self) -> bool:
         """Test system startup and health"""
         self.log("🚀 Testing System Startup", "TEST")
@@ -228,32 +280,25 @@ class AdvancedTestSuite:
         self.log("Services started, waiting for health checks...", "SUCCESS")
         
         # Wait for services to be ready
-        max_wait = 120  # seconds
-        start_time = time.time()
+        pending = list(self._health_urls)
         
-        services = {
-            "API Backend": f"{self.api_base}/docs",
-            "Vector Store": f"{self.vector_base}/docs",
-            "Streamlit UI": f"{self.ui_base}"
-        }
-        
-        while time.time() - start_time < max_wait:
-            all_ready = True
-            
-            for service_name, url in services.items():
+        def all_ready():
+            # HEAD skips the page bodies; any answer short of a 5xx means the service is up
+            for service_name, url in list(pending):
                 try:
-                    urllib.request.urlopen(url, timeout=5)
-                    self.log(f"{service_name}: Ready", "SUCCESS")
-                except:
-                    all_ready = False
-                    break
-            
-            if all_ready:
-                self.log("All services are healthy and ready", "SUCCESS")
-                self.results["startup"] = True
-                return True
-            
-            time.sleep(5)
+                    response = self.session.head(url, timeout=2, allow_redirects=False)
+                except requests.RequestException:
+                    return False
+                if response.status_code >= 500:
+                    return False
+                self.log(f"{service_name}: Ready", "SUCCESS")
+                pending.remove((service_name, url))
+            return True
+        
+        if self.wait_for(all_ready, max_wait=120):
+            self.log("All services are healthy and ready", "SUCCESS")
+            self.results["startup"] = True
+            return True
         
         self.log("Services did not become ready within timeout", "ERROR")
         self.results["startup"] = False
@@ -285,30 +330,26 @@ class AdvancedTestSuite:
                 "Employee Data: John Smith Engineering 85000 Sarah Johnson Marketing 70000 Mike Chen Engineering 90000"
             )
             
-            # Test document uploads
-            upload_results = []
-            
-            self.log("Uploading simple document...")
-            upload1 = self.upload_file(simple_pdf)
-            upload_results.append(("simple", upload1))
-            
-            if upload1["success"]:
-                self.log("Simple document uploaded successfully", "SUCCESS")
-                if "data" in upload1 and "document_id" in upload1["data"]:
-                    self.uploaded_documents.append(upload1["data"]["document_id"])
-            else:
-                self.log(f"Simple document upload failed: {upload1.get('error', 'Unknown error')}", "ERROR")
+            # Test document uploads, sent concurrently and reported in order
+            uploads = [
+                ("simple", "Simple document", simple_pdf),
+                ("table", "Table document", table_pdf)
+            ]
             
-            self.log("Uploading table document...")
-            upload2 = self.upload_file(table_pdf)
-            upload_results.append(("table", upload2))
+            self.log(f"Uploading {len(uploads)} documents...")
+            with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as pool:
+                responses = list(pool.map(self.upload_file, [path for _, _, path in uploads]))
             
-            if upload2["success"]:
-                self.log("Table document uploaded successfully", "SUCCESS")
-                if "data" in upload2 and "document_id" in upload2["data"]:
-                    self.uploaded_documents.append(upload2["data"]["document_id"])
-            else:
-                self.log(f"Table document upload failed: {upload2.get('error', 'Unknown error')}", "ERROR")
+            upload_results = []
+            for (kind, label, _), upload in zip(uploads, responses):
+                upload_results.append((kind, upload))
+                
+                if upload["success"]:
+                    self.log(f"{label} uploaded successfully", "SUCCESS")
+                    if "data" in upload and "document_id" in upload["data"]:
+                        self.uploaded_documents.append(upload["data"]["document_id"])
+                else:
+                    self.log(f"{label} upload failed: {upload.get('error', 'Unknown error')}", "ERROR")
         
         # Test document listing
         self.log("Testing document listing...")
@@ -361,18 +402,17 @@ class AdvancedTestSuite:
         
         search_results = []
         
-        for test in search_tests:
-            self.log(f"Testing: {test['name']}...")
-            
-            search_data = json.dumps({
-                "query": test["query"],
-                "limit": 10,
-                "min_similarity": 0.3  # Lower threshold for testing
-            }).encode('utf-8')
-            
-            headers = {"Content-Type": "application/json"}
-            result = self.make_request("POST", f"{self.api_base}/search", search_data, headers)
-            
+        def run_search(test):
+            # Lower similarity threshold for testing
+            search_data = (b'{"query":' + json.dumps(test["query"]).encode('utf-8')
+                           + b',"limit":10,"min_similarity":0.3}')
+            return self.make_request("POST", self._search_url, search_data, self._search_headers)
+        
+        self.log(f"Running {len(search_tests)} searches...")
+        with ThreadPoolExecutor(max_workers=MAX_PARALLEL_REQUESTS) as pool:
+            responses = list(pool.map(run_search, search_tests))
+        
+        for test, result in zip(search_tests, responses):
             if result["success"]:
                 result_count = len(result["data"]) if result["data"] else 0
                 self.log(f"{test['name']}: {result_count} results found", "SUCCESS")
@@ -511,8 +551,9 @@ class AdvancedTestSuite:
                 self.log("System startup failed, aborting remaining tests", "ERROR")
                 return False
             
-            # Wait a bit for services to fully initialize
-            time.sleep(10)
+            # Wait until the backend can reach the vector store
+            if not self.wait_for(self.documents_ready, max_wait=30):
+                self.log("Document listing not ready after 30s, continuing anyway", "WARNING")
             
             # 2. Document operation tests
             if not self.run_document_tests():
@@ -535,6 +576,8 @@ class AdvancedTestSuite:
         except Exception as e:
             self.log(f"Test suite failed with unexpected error: {e}", "ERROR")
             return False
+        finally:
+            self.session.close()
 
 
 def main():
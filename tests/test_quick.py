@@ -67,8 +67,7 @@ class QuickTestSuite:
         """Make API call with proper error handling"""
         try:
             url = self.api_url + endpoint
-            req = urllib.request.Request(url, data=data)
-            req.get_method = lambda: method
+            req = urllib.request.Request(url, data=data, method=method)
             
             if data and method == "POST":
                 req.add_header('Content-Type', 'application/json')
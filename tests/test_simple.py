@@ -193,8 +193,7 @@ class SimpleTestRunner:
                     req.data = data.encode('utf-8')
                 # Note: File uploads would need more complex handling
             elif method == "DELETE":
-                req = urllib.request.Request(url)
-                req.get_method = lambda: 'DELETE'
+                req = urllib.request.Request(url, method='DELETE')
             
             with urllib.request.urlopen(req, timeout=self.request_timeout) as response:
                 response_data = response.read().decode('utf-8')
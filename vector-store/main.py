@@ -1,14 +1,15 @@
 from fastapi import FastAPI, HTTPException, UploadFile, File
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import lancedb
 import PyPDF2
 import pdfplumber
 from sentence_transformers import SentenceTransformer
 import numpy as np
 import uuid
+import hashlib
 import os
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 import tempfile
 import io
 from datetime import datetime
@@ -26,6 +27,14 @@ os.makedirs(DB_PATH, exist_ok=True)
 # We'll initialize the table lazily when we first add data
 table = None
 
+# Content hash -> document_id for documents uploaded since startup, so clients
+# can skip re-uploading (and re-embedding) content that is already stored
+document_hashes: Dict[str, str] = {}
+
+def content_hash(data: bytes) -> str:
+    """Hash raw upload content for duplicate lookups"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
 def get_table():
     """Get or create the LanceDB table"""
     global table
@@ -50,6 +59,11 @@ class SearchRequest(BaseModel):
     limit: int = 10
     min_similarity: float = 0.5
 
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    limit: int = 10
+    min_similarity: float = 0.5
+
 class SearchResult(BaseModel):
     document_id: str
     filename: str
@@ -58,6 +72,12 @@ class SearchResult(BaseModel):
     content: str
     similarity_score: float
 
+# Prebuilt serializers for search responses. The SearchResults are already
+# validated when constructed, so dumping them straight to JSON skips FastAPI's
+# response_model re-validation and jsonable_encoder pass.
+SEARCH_RESULTS_ADAPTER = TypeAdapter(List[SearchResult])
+BATCH_SEARCH_RESULTS_ADAPTER = TypeAdapter(List[List[SearchResult]])
+
 class DocumentInfo(BaseModel):
     document_id: str
     filename: str
@@ -167,8 +187,11 @@ def generate_embedding(text: str) -> List[float]:
 @app.post("/upload-pdf")
 async def upload_pdf(file: UploadFile = File(...)):
     """Upload and process a PDF document"""
-    if not file.filename.endswith('.pdf'):
+    # Check the PDF magic bytes rather than the extension, so '.PDF' names pass
+    # and mis-named files are rejected before anything else is read
+    if await file.read(5) != b"%PDF-":
         raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    await file.seek(0)
     
     try:
         # Read the uploaded file
@@ -215,6 +238,7 @@ async def upload_pdf(file: UploadFile = File(...)):
             else:
                 # Add to existing table
                 current_table.add(documents_to_insert)
+            document_hashes[content_hash(content)] = document_id
         
         return {
             "document_id": document_id,
@@ -268,6 +292,7 @@ async def upload_text(request: dict):
                 current_table = create_table_with_data(documents_to_insert)
             else:
                 current_table.add(documents_to_insert)
+            document_hashes[content_hash(content.encode("utf-8"))] = document_id
         
         return {
             "document_id": document_id,
@@ -279,6 +304,62 @@ async def upload_text(request: dict):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing text: {str(e)}")
 
+def score_search_results(query: str, results: List[Dict[str, Any]], min_similarity: float) -> List[SearchResult]:
+    """Convert raw LanceDB hits into SearchResults above the similarity threshold, best first"""
+    search_results = []
+    # Query terms are the same for every hit, so split them once up front
+    query_terms = query.lower().split()
+    for result in results:
+        # Convert distance to similarity (lower distance = higher similarity)
+        # LanceDB returns squared L2 distance, we need better similarity conversion
+        distance = float(result["_distance"])
+        
+        # Method 1: Cosine-like similarity (better for semantic similarity)
+        # Since embeddings are normalized, L2 distance relates to cosine similarity
+        # For normalized vectors: cosine_sim = 1 - (L2_distance^2 / 2)
+        # But let's use a more robust approach for better scores
+        
+        # Method 2: Exponential decay (gives higher scores for close matches)
+        similarity_score = np.exp(-distance)  # Exponential decay
+        
+        # Method 3: Alternative - Gaussian-like similarity
+        # similarity_score = np.exp(-distance / 2.0)  # Slower decay, higher scores
+        
+        # Method 4: Hybrid approach - combine exact matching with semantic similarity
+        # Check if query terms appear in content for boost
+        content_lower = result["content"].lower()
+        exact_match_boost = 0.0
+        
+        # Boost score if exact terms are found
+        for term in query_terms:
+            if term in content_lower:
+                exact_match_boost += 0.2  # 20% boost per matching term
+        
+        # Apply exponential similarity with exact match boost
+        similarity_score = min(1.0, np.exp(-distance) + exact_match_boost)
+        
+        # Debug logging for distance analysis
+        print(f"Debug - Distance: {distance:.4f}, Base similarity: {np.exp(-distance):.4f}, "
+              f"Boost: {exact_match_boost:.2f}, Final: {similarity_score:.4f}, "
+              f"Content: {result['content'][:50]}...")
+        
+        # Only include results above the similarity threshold
+        if similarity_score >= min_similarity:
+            search_result = SearchResult(
+                document_id=result["document_id"],
+                filename=result["filename"],
+                page_number=result["page_number"],
+                line_number=result["line_number"],
+                content=result["content"],
+                similarity_score=similarity_score
+            )
+            search_results.append(search_result)
+    
+    # Sort by similarity score (highest first)
+    search_results.sort(key=lambda x: x.similarity_score, reverse=True)
+    
+    return search_results
+
 @app.post("/search", response_model=List[SearchResult])
 async def search_documents(search_request: SearchRequest):
     """Search for documents using vector similarity"""
@@ -293,63 +374,50 @@ async def search_documents(search_request: SearchRequest):
         # Perform vector search
         results = current_table.search(query_vector).limit(search_request.limit).to_list()
         
-        # Format results and filter by similarity threshold
-        search_results = []
-        for result in results:
-            # Convert distance to similarity (lower distance = higher similarity)
-            # LanceDB returns squared L2 distance, we need better similarity conversion
-            distance = float(result["_distance"])
-            
-            # Method 1: Cosine-like similarity (better for semantic similarity)
-            # Since embeddings are normalized, L2 distance relates to cosine similarity
-            # For normalized vectors: cosine_sim = 1 - (L2_distance^2 / 2)
-            # But let's use a more robust approach for better scores
-            
-            # Method 2: Exponential decay (gives higher scores for close matches)
-            similarity_score = np.exp(-distance)  # Exponential decay
-            
-            # Method 3: Alternative - Gaussian-like similarity
-            # similarity_score = np.exp(-distance / 2.0)  # Slower decay, higher scores
-            
-            # Method 4: Hybrid approach - combine exact matching with semantic similarity
-            # Check if query terms appear in content for boost
-            query_terms = search_request.query.lower().split()
-            content_lower = result["content"].lower()
-            exact_match_boost = 0.0
-            
-            # Boost score if exact terms are found
-            for term in query_terms:
-                if term in content_lower:
-                    exact_match_boost += 0.2  # 20% boost per matching term
-            
-            # Apply exponential similarity with exact match boost
-            similarity_score = min(1.0, np.exp(-distance) + exact_match_boost)
-            
-            # Debug logging for distance analysis
-            print(f"Debug - Distance: {distance:.4f}, Base similarity: {np.exp(-distance):.4f}, "
-                  f"Boost: {exact_match_boost:.2f}, Final: {similarity_score:.4f}, "
-                  f"Content: {result['content'][:50]}...")
-            
-            # Only include results above the similarity threshold
-            if similarity_score >= search_request.min_similarity:
-                search_result = SearchResult(
-                    document_id=result["document_id"],
-                    filename=result["filename"],
-                    page_number=result["page_number"],
-                    line_number=result["line_number"],
-                    content=result["content"],
-                    similarity_score=similarity_score
-                )
-                search_results.append(search_result)
-        
-        # Sort by similarity score (highest first)
-        search_results.sort(key=lambda x: x.similarity_score, reverse=True)
-        
-        return search_results
+        search_results = score_search_results(search_request.query, results, search_request.min_similarity)
+        return Response(
+            content=SEARCH_RESULTS_ADAPTER.dump_json(search_results),
+            media_type="application/json"
+        )
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error during search: {str(e)}")
 
+@app.post("/search-batch", response_model=List[List[SearchResult]])
+async def search_documents_batch(batch_request: BatchSearchRequest):
+    """Search for several queries at once, returning one result list per query in input order"""
+    try:
+        current_table = get_table()
+        if current_table is None:
+            return [[] for _ in batch_request.queries]
+        
+        # Embed every query in a single model call
+        query_vectors = model.encode(batch_request.queries)
+        
+        batch_results = [
+            score_search_results(
+                query,
+                current_table.search(query_vector.tolist()).limit(batch_request.limit).to_list(),
+                batch_request.min_similarity
+            )
+            for query, query_vector in zip(batch_request.queries, query_vectors)
+        ]
+        return Response(
+            content=BATCH_SEARCH_RESULTS_ADAPTER.dump_json(batch_results),
+            media_type="application/json"
+        )
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error during batch search: {str(e)}")
+
+@app.get("/documents/by-hash/{hash_value}")
+async def get_document_by_hash(hash_value: str):
+    """Look up a previously uploaded document by the BLAKE2b-128 hash of its content"""
+    document_id = document_hashes.get(hash_value)
+    if document_id is None:
+        raise HTTPException(status_code=404, detail="No document with this content hash")
+    return {"document_id": document_id, "content_hash": hash_value}
+
 @app.get("/documents/{document_id}")
 async def get_document_lines(document_id: str):
     """Get all lines for a specific document"""
@@ -471,6 +539,7 @@ async def delete_all_documents():
         try:
             db.drop_table("documents")
             table = None  # Reset global table reference
+            document_hashes.clear()
             return {
                 "message": "All documents deleted successfully",
                 "deleted_documents": unique_docs,
@@ -533,6 +602,9 @@ async def delete_document(document_id: str):
             remaining_records = remaining_data.to_dict('records')
             table = db.create_table("documents", remaining_records)
         
+        for hash_value in [h for h, doc_id in document_hashes.items() if doc_id == document_id]:
+            del document_hashes[hash_value]
+        
         return {
             "message": f"Document deleted successfully",
             "document_id": document_id,